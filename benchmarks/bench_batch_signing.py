@@ -0,0 +1,85 @@
+# benchmarks/bench_batch_signing.py
+"""
+Compara a assinatura RSA-PSS de cada voto com a assinatura em lote sobre a raiz de Merkle.
+
+Para cada tamanho de lote são medidos o custo de assinar e o custo de verificar todos os votos, usando o
+CriptografiaService com chaves geradas em um diretório temporário.
+
+Uso:
+    python -m benchmarks.bench_batch_signing [--votos 2000] [--algoritmo rsa|ed25519]
+"""
+import argparse
+import base64
+import tempfile
+import time
+from pathlib import Path
+
+from core.utils.security import KeyManager, CryptographyKeyManager
+from core.processors.classes import CriptografiaService
+
+
+def criar_servico(diretorio: Path, algoritmo: str) -> CriptografiaService:
+    chave_privada = KeyManager(private_key_path=(diretorio / 'private_key.pem').as_posix())
+    chave_privada.generate_private_key(algoritmo)
+    chave_privada.save_private_key()
+    chave_criptografia = CryptographyKeyManager(key_path=(diretorio / 'cryptography_key.pem').as_posix())
+    chave_criptografia.generate_key()
+    chave_criptografia.save_key()
+    return CriptografiaService(chave_privada.private_key_path.as_posix(), chave_criptografia.key_path.as_posix())
+
+
+def gerar_votos(quantidade: int) -> list[str]:
+    # JSON com tamanho próximo ao de um Voto serializado
+    return [f'{{"id":{i},"candidato":{{"id":{i % 7},"nome":"Candidato {i % 7}"}},"nonce":"{i:032x}"}}' + " " * 500
+            for i in range(quantidade)]
+
+
+def medir_individual(servico: CriptografiaService, votos: list[str]) -> tuple[float, float]:
+    inicio = time.perf_counter()
+    assinados = [{"voto": voto, "assinatura": base64.b64encode(servico.assinar_dados(voto)).decode()}
+                 for voto in votos]
+    assinatura = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    assert all(servico.verificar_voto_assinado(voto_assinado) for voto_assinado in assinados)
+    return assinatura, time.perf_counter() - inicio
+
+
+def medir_lote(servico: CriptografiaService, votos: list[str], tamanho_lote: int) -> tuple[float, float]:
+    inicio = time.perf_counter()
+    assinados = []
+    for inicio_lote in range(0, len(votos), tamanho_lote):
+        lote = votos[inicio_lote:inicio_lote + tamanho_lote]
+        arvore, assinatura = servico.assinar_lote(lote)
+        raiz, assinatura_b64 = arvore.root.hex(), base64.b64encode(assinatura).decode()
+        assinados.extend({"voto": voto, "lote": {"raiz": raiz, "assinatura": assinatura_b64,
+                                                 "caminho": arvore.get_proof(posicao)}}
+                         for posicao, voto in enumerate(lote))
+    assinatura = time.perf_counter() - inicio
+
+    servico._raizes_verificadas.clear()
+    inicio = time.perf_counter()
+    assert all(servico.verificar_voto_assinado(voto_assinado) for voto_assinado in assinados)
+    return assinatura, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--votos", type=int, default=2000)
+    parser.add_argument("--algoritmo", choices=[KeyManager.RSA, KeyManager.ED25519], default=KeyManager.RSA)
+    args = parser.parse_args()
+
+    votos = gerar_votos(args.votos)
+    with tempfile.TemporaryDirectory() as diretorio:
+        servico = criar_servico(Path(diretorio), args.algoritmo)
+        print(f"{'modo':<22}{'assinatura (votos/s)':>22}{'verificação (votos/s)':>24}")
+        assinatura, verificacao = medir_individual(servico, votos)
+        print(f"{'1 assinatura/voto':<22}{len(votos) / assinatura:>22.0f}{len(votos) / verificacao:>24.0f}")
+        for tamanho_lote in (10, 100, 1000):
+            assinatura, verificacao = medir_lote(servico, votos, tamanho_lote)
+            print(f"{f'lote de {tamanho_lote}':<22}{len(votos) / assinatura:>22.0f}"
+                  f"{len(votos) / verificacao:>24.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# benchmarks/bench_block_batching.py
+"""
+Compara a política de um bloco por voto com o agrupamento de transações em blocos (group commit).
+
+Mede votos/s na ingestão, tamanho da cadeia e tempo de validação completa. As transações são sintéticas,
+com o mesmo tamanho aproximado de um voto criptografado, para isolar o custo da blockchain do custo
+da assinatura RSA (que independe do agrupamento).
+
+Uso:
+    python -m benchmarks.bench_block_batching [--votos 20000]
+"""
+import argparse
+import base64
+import os
+import time
+
+from core.blockchain.classes import Blockchain, BatchPolicy
+
+TAMANHO_TRANSACAO = 1400
+
+
+def gerar_transacoes(quantidade: int) -> list[str]:
+    return [base64.b64encode(os.urandom(TAMANHO_TRANSACAO)).decode() for _ in range(quantidade)]
+
+
+def medir(transacoes: list[str], politica: BatchPolicy) -> dict:
+    blockchain = Blockchain(batch_policy=politica)
+    inicio = time.perf_counter()
+    for transacao in transacoes:
+        blockchain.add_transaction(transacao)
+        blockchain.mine_if_due()
+    blockchain.flush()
+    duracao = time.perf_counter() - inicio
+
+    inicio_validacao = time.perf_counter()
+    valida = blockchain.is_chain_valid()
+    duracao_validacao = time.perf_counter() - inicio_validacao
+    return {
+        "votos_por_segundo": len(transacoes) / duracao,
+        "blocos": len(blockchain.chain),
+        "validacao_s": duracao_validacao,
+        "valida": valida,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--votos", type=int, default=20000)
+    args = parser.parse_args()
+
+    transacoes = gerar_transacoes(args.votos)
+    politicas = [
+        ("1 voto/bloco", BatchPolicy(max_transactions=1)),
+        ("10 votos/bloco", BatchPolicy(max_transactions=10)),
+        ("100 votos/bloco", BatchPolicy(max_transactions=100)),
+        ("1000 votos/bloco", BatchPolicy(max_transactions=1000)),
+        ("50 ms", BatchPolicy(max_transactions=None, max_interval_ms=50)),
+    ]
+    print(f"{'política':<18}{'votos/s':>12}{'blocos':>10}{'validação (s)':>16}")
+    for nome, politica in politicas:
+        resultado = medir(transacoes, politica)
+        print(f"{nome:<18}{resultado['votos_por_segundo']:>12.0f}{resultado['blocos']:>10}"
+              f"{resultado['validacao_s']:>16.4f}")
+
+
+if __name__ == "__main__":
+    main()
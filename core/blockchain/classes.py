@@ -1,56 +1,349 @@
 import hashlib
 import json
-from datetime import datetime
+import time
+from datetime import timezone
+
+from core.blockchain.encoding import (encode_block, decode_block, decode_header, encode_header,
+                                      timestamp_from_legacy, ZERO_HASH)
+from core.blockchain.merkle import MerkleTree, hash_leaf
+
+
+def current_timestamp():
+    # Timestamps dos blocos são inteiros em microssegundos desde a época
+    return time.time_ns() // 1000
 
 
 class Block:
-    def __init__(self, index, timestamp, transactions, previous_hash):
+    def __init__(self, index, timestamp, transactions, previous_hash, merkle_root=None, block_hash=None):
         self.index = index
         self.timestamp = timestamp
         self.transactions = transactions
         self.previous_hash = previous_hash
-        self.hash = self.calculate_hash()
+        self._merkle_tree = None
+        # Blocos lidos do armazenamento reaproveitam o cabeçalho gravado; a conferência fica com is_chain_valid
+        self.merkle_root = merkle_root or self.merkle_tree.root.hex()
+        self.hash = block_hash or self.calculate_header_hash()
+
+    @property
+    def merkle_tree(self):
+        if self._merkle_tree is None:
+            self._merkle_tree = MerkleTree.from_transactions(self.transactions)
+        return self._merkle_tree
+
+    def header_bytes(self, merkle_root=None):
+        return encode_header(self.index, self.timestamp, self.previous_hash, merkle_root or self.merkle_root,
+                             len(self.transactions))
+
+    def calculate_header_hash(self, merkle_root=None):
+        # O cabeçalho binário de tamanho fixo compromete apenas a raiz de Merkle, e não as transações em si
+        return hashlib.sha256(self.header_bytes(merkle_root)).hexdigest()
 
     def calculate_hash(self):
-        data_string = json.dumps(self.transactions, sort_keys=True)
-        return hashlib.sha256(f"{self.index}{self.timestamp}{data_string}{self.previous_hash}".encode()).hexdigest()
+        # Recalcula a raiz a partir das transações para detectar adulterações no conteúdo do bloco
+        return self.calculate_header_hash(MerkleTree.from_transactions(self.transactions).root.hex())
+
+    def has_valid_hash(self):
+        # O hash guardado precisa ser o do cabeçalho gravado e o do cabeçalho recalculado a partir das transações
+        header_hash = self.calculate_header_hash()
+        return self.hash == header_hash and header_hash == self.calculate_hash()
+
+    def get_inclusion_proof(self, position):
+        return self.merkle_tree.get_proof(position)
+
+    def to_bytes(self):
+        # Formato binário versionado, usado para hash, armazenamento e transferência
+        return encode_block(self.index, self.timestamp, self.previous_hash, self.merkle_root, self.transactions)
+
+    @classmethod
+    def from_bytes(cls, data):
+        header, fields = decode_block(data)
+        return cls(fields["index"], fields["timestamp"], fields["transactions"], fields["previous_hash"],
+                   merkle_root=fields["merkle_root"], block_hash=hashlib.sha256(header).hexdigest())
+
+
+class BatchPolicy:
+    """
+    Política de agrupamento de transações em blocos (group commit).
+
+    Um bloco é selado quando acumula `max_transactions` transações ou quando a transação pendente mais
+    antiga espera mais que `max_interval_ms` milissegundos. O padrão (1 transação) mantém um bloco por voto.
+
+    A política é avaliada de forma preguiçosa, quando uma transação chega ou quando `mine_if_due` é chamado: sem
+    novas transações, o prazo só é cumprido se alguém chamar `mine_if_due` periodicamente (o pipeline assíncrono de
+    votação faz isso; `VotoService.selar_se_vencido` também considera o lote de assinatura).
+    """
+
+    def __init__(self, max_transactions=1, max_interval_ms=None):
+        if max_transactions is not None and max_transactions < 1:
+            raise ValueError("max_transactions deve ser um inteiro positivo.")
+        if max_interval_ms is not None and max_interval_ms < 0:
+            raise ValueError("max_interval_ms não pode ser negativo.")
+        self.max_transactions = max_transactions
+        self.max_interval_ms = max_interval_ms
+
+    def is_due(self, pending_count, first_pending_at):
+        if pending_count == 0:
+            return False
+        if self.max_transactions is not None and pending_count >= self.max_transactions:
+            return True
+        if self.max_interval_ms is not None and first_pending_at is not None:
+            return (time.monotonic() - first_pending_at) * 1000 >= self.max_interval_ms
+        return False
 
 
 class Blockchain:
-    def __init__(self):
-        self.chain = [self.create_genesis_block()]
+    def __init__(self, batch_policy=None, store=None):
+        # Sem armazenamento a cadeia fica em memória; com um ChainStore os blocos são persistidos em disco
+        self.chain = store if store is not None else []
+        if len(self.chain) == 0:
+            self.chain.append(self.create_genesis_block())
         self.pending_transactions = []
+        self.batch_policy = batch_policy or BatchPolicy()
+        self._first_pending_at = None
+        # Prefixo da cadeia já verificado: índice do último bloco conferido e o hash dele naquele momento
+        self._verified_index = 0
+        self._verified_hash = self.chain[0].hash
+        # Índices de consulta: digest da transação -> (bloco, posição) e hash do bloco -> índice do bloco.
+        # Cadeias reabertas do disco são indexadas sob demanda, na primeira consulta.
+        self._transaction_index = {}
+        self._block_hash_index = {}
+        self._indexed_blocks = 0
+        # Funções chamadas a cada bloco selado, usadas para manter agregados incrementais (ex.: apuração)
+        self._block_listeners = []
+
+    @staticmethod
+    def legacy_hash(legacy):
+        # Hash da representação anterior: SHA-256 sobre índice, timestamp, JSON das transações e hash anterior
+        data_string = json.dumps(legacy["transactions"], sort_keys=True)
+        return hashlib.sha256(
+            f"{legacy['index']}{legacy['timestamp']}{data_string}{legacy['previous_hash']}".encode()).hexdigest()
+
+    @classmethod
+    def from_legacy_blocks(cls, legacy_blocks, batch_policy=None, store=None, legacy_timezone=timezone.utc):
+        """
+        Converte blocos da representação anterior (timestamp textual e hash sobre o JSON das transações) para o
+        formato binário, refazendo o encadeamento com os novos hashes de cabeçalho.
+
+        Antes da conversão, cada bloco é conferido no formato anterior: o hash gravado precisa ser o recalculado, o
+        previous_hash precisa apontar para o hash do bloco anterior e os índices precisam ser sequenciais.
+
+        :param legacy_blocks: Iterável de dicionários com index, timestamp, transactions, previous_hash e hash, em
+            ordem.
+        :param legacy_timezone: Fuso horário em que os timestamps textuais foram gravados (padrão: UTC).
+        :raises ValueError: Se algum bloco da cadeia anterior estiver adulterado ou fora de encadeamento.
+        """
+        chain = store if store is not None else []
+        previous_hash = ZERO_HASH
+        previous_legacy_hash = None
+        for position, legacy in enumerate(legacy_blocks):
+            if legacy["index"] != position:
+                raise ValueError(f"Bloco anterior fora de ordem: índice {legacy['index']} na posição {position}.")
+            if cls.legacy_hash(legacy) != legacy["hash"]:
+                raise ValueError(f"O hash do bloco anterior {position} não confere com o seu conteúdo.")
+            if previous_legacy_hash is not None and legacy["previous_hash"] != previous_legacy_hash:
+                raise ValueError(f"O bloco anterior {position} não está encadeado ao bloco {position - 1}.")
+            previous_legacy_hash = legacy["hash"]
+            block = Block(legacy["index"], timestamp_from_legacy(legacy["timestamp"], legacy_timezone),
+                          legacy["transactions"], previous_hash)
+            chain.append(block)
+            previous_hash = block.hash
+        return cls(batch_policy=batch_policy, store=chain)
 
     def create_genesis_block(self):
-        return Block(0, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), [], "0")
+        return Block(0, current_timestamp(), [], ZERO_HASH)
+
+    def export_state(self):
+        """
+        Exporta o estado da blockchain (cadeia, transações pendentes, checkpoint e índices) em tipos primitivos,
+        para gravação em snapshot.
+        """
+        if isinstance(self.chain, list):
+            chain_state = {"blocks": [block.to_bytes() for block in self.chain]}
+        else:
+            # Cadeias persistidas em disco não são copiadas: o snapshot guarda apenas a referência e a cabeça
+            chain_state = {"store": str(self.chain.directory)}
+        chain_state["length"] = len(self.chain)
+        chain_state["head_hash"] = self.chain[-1].hash
+        self._ensure_indexes()
+        return {
+            "chain": chain_state,
+            "pending_transactions": list(self.pending_transactions),
+            "verified": (self._verified_index, self._verified_hash),
+            "transaction_index": self._transaction_index,
+            "block_hash_index": self._block_hash_index,
+        }
+
+    def load_state(self, state):
+        """
+        Restaura o estado exportado por `export_state`. Apenas a cabeça da cadeia é conferida; o checkpoint de
+        validação gravado é reaproveitado, sem revalidar bloco a bloco.
+
+        Cadeias persistidas em disco podem conter blocos gravados depois do snapshot (por exemplo, após uma queda
+        durante a votação). Nesse caso, o bloco na posição da cabeça registrada precisa ter o mesmo hash, e apenas
+        os blocos posteriores são conferidos; transações pendentes no snapshot que já foram seladas são descartadas.
+
+        :return: A quantidade de blocos registrada no snapshot (índice do primeiro bloco posterior a ele).
+        :raises ValueError: Se a cadeia restaurada não contiver a cabeça registrada no snapshot ou se um bloco
+            posterior a ela for inválido.
+        """
+        chain_state = state["chain"]
+        if "blocks" in chain_state:
+            chain = [Block.from_bytes(data) for data in chain_state["blocks"]]
+        elif not isinstance(self.chain, list) and str(self.chain.directory) == chain_state["store"]:
+            chain = self.chain
+        else:
+            from core.blockchain.storage import SegmentedChainStore
+            chain = SegmentedChainStore(chain_state["store"])
+        length = chain_state["length"]
+        if len(chain) < length or chain[length - 1].hash != chain_state["head_hash"]:
+            raise ValueError("A cadeia restaurada não corresponde à cabeça registrada no snapshot.")
+        sealed = set()
+        for index in range(length, len(chain)):
+            block = chain[index]
+            if block.hash != block.calculate_hash() or block.previous_hash != chain[index - 1].hash:
+                raise ValueError(f"O bloco {index}, gravado após o snapshot, é inválido.")
+            sealed.update(hash_leaf(transaction).hex() for transaction in block.transactions)
+
+        self.chain = chain
+        self.pending_transactions = [transaction for transaction in state["pending_transactions"]
+                                     if hash_leaf(transaction).hex() not in sealed]
+        self._first_pending_at = time.monotonic() if self.pending_transactions else None
+        self._verified_index, self._verified_hash = state["verified"]
+        self._transaction_index = dict(state["transaction_index"])
+        self._block_hash_index = dict(state["block_hash_index"])
+        # Os blocos posteriores ao snapshot são indexados sob demanda
+        self._indexed_blocks = length
+        return length
 
     def add_block(self, transactions):
         previous_block = self.chain[-1]
-        new_block = Block(len(self.chain), datetime.now().strftime("%Y-%m-%d %H:%M:%S"), transactions,
-                          previous_block.hash)
+        new_block = Block(len(self.chain), current_timestamp(), transactions, previous_block.hash)
         self.chain.append(new_block)
+        if self._indexed_blocks == new_block.index:
+            self._index_block(new_block)
+        for listener in self._block_listeners:
+            listener(new_block)
+
+    def add_block_listener(self, listener):
+        self._block_listeners.append(listener)
 
     def add_transaction(self, transaction):
+        if not self.pending_transactions:
+            self._first_pending_at = time.monotonic()
         self.pending_transactions.append(transaction)
 
     def mine_pending_transactions(self):
         if len(self.pending_transactions) > 0:
             self.add_block(self.pending_transactions)
             self.pending_transactions = []
+            self._first_pending_at = None
+
+    def is_batch_due(self):
+        return self.batch_policy.is_due(len(self.pending_transactions), self._first_pending_at)
+
+    def mine_if_due(self):
+        # Sela as transações pendentes somente quando a política de agrupamento exigir
+        if self.is_batch_due():
+            self.mine_pending_transactions()
+            return True
+        return False
+
+    def flush(self):
+        self.mine_pending_transactions()
 
     def get_block_by_index(self, index):
         if 0 <= index < len(self.chain):
             return self.chain[index]
         return None
 
-    def is_chain_valid(self):
-        for i in range(1, len(self.chain)):
+    def _index_block(self, block):
+        self._block_hash_index[block.hash] = block.index
+        for position, transaction in enumerate(block.transactions):
+            # Mantém a primeira ocorrência de uma transação repetida
+            self._transaction_index.setdefault(hash_leaf(transaction).hex(), (block.index, position))
+        self._indexed_blocks = block.index + 1
+
+    def _ensure_indexes(self):
+        for index in range(self._indexed_blocks, len(self.chain)):
+            self._index_block(self.chain[index])
+
+    def get_block_by_hash(self, block_hash):
+        self._ensure_indexes()
+        index = self._block_hash_index.get(block_hash)
+        return self.chain[index] if index is not None else None
+
+    def locate_transaction(self, transaction):
+        # Retorna (índice do bloco, posição no bloco) da transação, ou None se ela não estiver selada na cadeia
+        self._ensure_indexes()
+        return self._transaction_index.get(hash_leaf(transaction).hex())
+
+    def iter_merkle_roots(self):
+        # Com o armazenamento em disco, apenas os cabeçalhos dos blocos são lidos
+        from core.blockchain.storage import SegmentedChainStore
+        if isinstance(self.chain, SegmentedChainStore):
+            for index in range(len(self.chain)):
+                yield decode_header(self.chain.read_header(index))["merkle_root"]
+        else:
+            for block in self.chain:
+                yield block.merkle_root
+
+    def get_chain_merkle_root(self):
+        """
+        Calcula a raiz de Merkle sobre as raízes de Merkle de todos os blocos da cadeia.
+
+        :return: A raiz, em hexadecimal.
+        """
+        return MerkleTree([hash_leaf(bytes.fromhex(root)) for root in self.iter_merkle_roots()]).root.hex()
+
+    def get_inclusion_proof(self, transaction):
+        # Localiza a transação e devolve tudo que é necessário para conferi-la contra o cabeçalho do bloco
+        location = self.locate_transaction(transaction)
+        if location is None:
+            return None
+        block_index, position = location
+        block = self.chain[block_index]
+        return {
+            "block_index": block.index,
+            "block_hash": block.hash,
+            "position": position,
+            "merkle_root": block.merkle_root,
+            "proof": block.get_inclusion_proof(position),
+        }
+
+    def verify_inclusion_proof(self, transaction, inclusion_proof):
+        # A raiz da prova precisa ser a mesma comprometida pelo bloco da cadeia
+        block = self.get_block_by_index(inclusion_proof["block_index"])
+        if block is None or block.merkle_root != inclusion_proof["merkle_root"]:
+            return False
+        return MerkleTree.verify_proof(transaction, inclusion_proof["proof"], inclusion_proof["merkle_root"])
+
+    def find_first_invalid_block(self, start=1, workers=None):
+        # Com workers > 1 a validação é distribuída por faixas de blocos em um pool de processos
+        if workers and workers > 1:
+            from core.blockchain.validation import ParallelChainValidator
+            return ParallelChainValidator(workers).find_first_invalid_block(self.chain, start)
+        for i in range(start, len(self.chain)):
             current_block = self.chain[i]
             previous_block = self.chain[i - 1]
-            if current_block.hash != current_block.calculate_hash():
-                return False
-            if current_block.previous_hash != previous_block.hash:
-                return False
+            if not current_block.has_valid_hash() or current_block.previous_hash != previous_block.hash:
+                return i
+        return None
+
+    def is_chain_valid(self, full=False, workers=None):
+        # Por padrão só os blocos adicionados após o último checkpoint são conferidos; full=True refaz tudo (auditoria)
+        start = 1
+        if not full and self._verified_index < len(self.chain) \
+                and self.chain[self._verified_index].hash == self._verified_hash:
+            start = self._verified_index + 1
+        invalid_index = self.find_first_invalid_block(start, workers)
+        if invalid_index is not None:
+            # Um bloco inválido anterior ao checkpoint invalida o prefixo verificado
+            if invalid_index <= self._verified_index:
+                self._verified_index = invalid_index - 1
+                self._verified_hash = self.chain[invalid_index - 1].hash
+            return False
+        self._verified_index = len(self.chain) - 1
+        self._verified_hash = self.chain[-1].hash
         return True
 
 
@@ -58,6 +351,14 @@ class VotingSystem:
     def __init__(self):
         self.blockchain = Blockchain()
         self.votes = {}
+        # Apuração corrente por candidato, atualizada a cada bloco selado
+        self.tally = {}
+        self.blockchain.add_block_listener(self._count_block)
+
+    def _count_block(self, block):
+        for transaction in block.transactions:
+            candidate_id = transaction["candidate_id"]
+            self.tally[candidate_id] = self.tally.get(candidate_id, 0) + 1
 
     def add_vote(self, voter_id, candidate_id):
         if voter_id not in self.votes:
@@ -71,6 +372,11 @@ class VotingSystem:
         return False
 
     def tally_votes(self):
+        self.blockchain.mine_pending_transactions()
+        return dict(self.tally)
+
+    def recount_votes(self):
+        # Recontagem completa a partir da cadeia, para conferência da apuração corrente
         self.blockchain.mine_pending_transactions()
         tally = {}
         for block in self.blockchain.chain:
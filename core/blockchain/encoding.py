@@ -0,0 +1,161 @@
+# blockchain/encoding.py
+import base64
+import binascii
+import json
+import struct
+from datetime import datetime, timezone, tzinfo
+
+# Versão do formato binário de blocos. Alterações no layout do cabeçalho exigem uma nova versão.
+BLOCK_FORMAT_VERSION = 1
+
+# versão (uint8), índice (uint64), timestamp em microssegundos (int64), previous_hash (32 bytes),
+# raiz de Merkle (32 bytes) e quantidade de transações (uint32)
+BLOCK_HEADER = struct.Struct(">BQq32s32sI")
+TRANSACTION_LENGTH = struct.Struct(">I")
+
+# Tipos de transação, gravados no primeiro byte de cada transação codificada
+TX_RAW = 0
+TX_TEXT = 1
+TX_JSON = 2
+# Token Fernet (já em base64 url-safe) codificado novamente em base64 pelo CriptografiaService;
+# é guardado como os bytes crus do token e reconstruído na decodificação.
+TX_FERNET_B64 = 3
+
+FERNET_VERSION = 0x80
+ZERO_HASH = "0" * 64
+LEGACY_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _compact_fernet(transaction: str):
+    # Retorna os bytes crus do token somente se a reconstrução devolver exatamente a mesma string
+    try:
+        token = base64.b64decode(transaction, validate=True)
+        raw = base64.urlsafe_b64decode(token)
+    except (binascii.Error, ValueError):
+        return None
+    if not raw or raw[0] != FERNET_VERSION:
+        return None
+    if base64.b64encode(base64.urlsafe_b64encode(raw)).decode() != transaction:
+        return None
+    return raw
+
+
+def encode_transaction(transaction) -> bytes:
+    """
+    Codifica uma transação no formato binário: um byte de tipo seguido do conteúdo.
+
+    :param transaction: A transação (bytes, str ou objeto serializável em JSON).
+    :return: Os bytes da transação codificada.
+    """
+    if isinstance(transaction, bytes):
+        return bytes([TX_RAW]) + transaction
+    if isinstance(transaction, str):
+        raw = _compact_fernet(transaction)
+        if raw is not None:
+            return bytes([TX_FERNET_B64]) + raw
+        return bytes([TX_TEXT]) + transaction.encode()
+    return bytes([TX_JSON]) + json.dumps(transaction, sort_keys=True, separators=(",", ":")).encode()
+
+
+def decode_transaction(data: bytes):
+    """
+    Decodifica uma transação gerada por `encode_transaction`, devolvendo a representação original.
+
+    :param data: Os bytes da transação codificada.
+    :return: A transação original.
+    """
+    kind, payload = data[0], bytes(data[1:])
+    if kind == TX_RAW:
+        return payload
+    if kind == TX_TEXT:
+        return payload.decode()
+    if kind == TX_FERNET_B64:
+        return base64.b64encode(base64.urlsafe_b64encode(payload)).decode()
+    if kind == TX_JSON:
+        return json.loads(payload)
+    raise ValueError(f"Tipo de transação desconhecido: {kind}")
+
+
+def encode_header(index: int, timestamp: int, previous_hash: str, merkle_root: str, transaction_count: int) -> bytes:
+    return BLOCK_HEADER.pack(BLOCK_FORMAT_VERSION, index, timestamp, bytes.fromhex(previous_hash),
+                             bytes.fromhex(merkle_root), transaction_count)
+
+
+def decode_header(data: bytes) -> dict:
+    """
+    Decodifica apenas o cabeçalho de um bloco gerado por `encode_block`.
+
+    :param data: Os bytes do bloco, ou apenas os do cabeçalho.
+    :return: Um dicionário com os campos do cabeçalho.
+    """
+    version, index, timestamp, previous_hash, merkle_root, count = BLOCK_HEADER.unpack_from(data)
+    if version != BLOCK_FORMAT_VERSION:
+        raise ValueError(f"Versão de bloco não suportada: {version}")
+    return {
+        "index": index,
+        "timestamp": timestamp,
+        "previous_hash": previous_hash.hex(),
+        "merkle_root": merkle_root.hex(),
+        "transaction_count": count,
+    }
+
+
+def encode_block(index: int, timestamp: int, previous_hash: str, merkle_root: str, transactions) -> bytes:
+    """
+    Codifica um bloco: cabeçalho de tamanho fixo seguido das transações prefixadas pelo tamanho.
+
+    :return: Os bytes do bloco.
+    """
+    parts = [encode_header(index, timestamp, previous_hash, merkle_root, len(transactions))]
+    for transaction in transactions:
+        encoded = encode_transaction(transaction)
+        parts.append(TRANSACTION_LENGTH.pack(len(encoded)))
+        parts.append(encoded)
+    return b"".join(parts)
+
+
+def decode_block(data: bytes) -> tuple[bytes, dict]:
+    """
+    Decodifica um bloco gerado por `encode_block`.
+
+    :param data: Os bytes do bloco.
+    :return: Os bytes do cabeçalho e um dicionário com os campos do bloco.
+    """
+    version, index, timestamp, previous_hash, merkle_root, count = BLOCK_HEADER.unpack_from(data)
+    if version != BLOCK_FORMAT_VERSION:
+        raise ValueError(f"Versão de bloco não suportada: {version}")
+    view = memoryview(data)
+    offset = BLOCK_HEADER.size
+    transactions = []
+    for _ in range(count):
+        (length,) = TRANSACTION_LENGTH.unpack_from(view, offset)
+        offset += TRANSACTION_LENGTH.size
+        transactions.append(decode_transaction(view[offset:offset + length]))
+        offset += length
+    if offset != len(data):
+        raise ValueError("Bloco com bytes excedentes após as transações.")
+    fields = {
+        "index": index,
+        "timestamp": timestamp,
+        "transactions": transactions,
+        "previous_hash": previous_hash.hex(),
+        "merkle_root": merkle_root.hex(),
+    }
+    return bytes(view[:BLOCK_HEADER.size]), fields
+
+
+def timestamp_from_legacy(timestamp, zone: tzinfo = timezone.utc) -> int:
+    """
+    Converte o timestamp textual do formato anterior ("%Y-%m-%d %H:%M:%S") para microssegundos desde a época.
+
+    O timestamp textual não traz fuso horário; ele é interpretado no fuso informado, e não no fuso local da máquina,
+    para que a conversão (e os hashes dos blocos convertidos) seja a mesma em qualquer máquina.
+
+    :param timestamp: O timestamp textual ou já inteiro.
+    :param zone: O fuso horário em que os timestamps textuais foram gravados (padrão: UTC).
+    :return: O timestamp em microssegundos.
+    """
+    if isinstance(timestamp, int):
+        return timestamp
+    moment = datetime.strptime(timestamp, LEGACY_TIMESTAMP_FORMAT).replace(tzinfo=zone)
+    return int(moment.timestamp()) * 1_000_000
@@ -0,0 +1,98 @@
+# blockchain/merkle.py
+import hashlib
+
+from core.blockchain.encoding import encode_transaction
+
+# Prefixos de domínio para impedir que um nó interno seja apresentado como folha (ataque de segunda pré-imagem)
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+
+def hash_leaf(transaction) -> bytes:
+    """
+    Calcula o hash de folha de uma transação.
+
+    :param transaction: A transação.
+    :return: O hash SHA-256 da folha.
+    """
+    # O hash é calculado sobre a codificação binária compacta, a mesma usada no armazenamento
+    return hashlib.sha256(LEAF_PREFIX + encode_transaction(transaction)).digest()
+
+
+def hash_node(left: bytes, right: bytes) -> bytes:
+    """
+    Calcula o hash de um nó interno a partir dos hashes dos filhos.
+
+    :param left: Hash do filho à esquerda.
+    :param right: Hash do filho à direita.
+    :return: O hash SHA-256 do nó.
+    """
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+class MerkleTree:
+    """
+    Árvore de Merkle sobre as transações de um bloco.
+
+    Nós ímpares de um nível são promovidos sem duplicação, de forma que uma transação repetida
+    não produz a mesma raiz que a lista sem a repetição.
+    """
+
+    EMPTY_ROOT = hashlib.sha256(b"").digest()
+
+    def __init__(self, leaves: list[bytes]):
+        """
+        Constrói a árvore a partir dos hashes de folha.
+
+        :param leaves: Lista de hashes de folha (ver `hash_leaf`).
+        """
+        self.levels = [list(leaves)]
+        level = self.levels[0]
+        while len(level) > 1:
+            level = [hash_node(level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+                     for i in range(0, len(level), 2)]
+            self.levels.append(level)
+
+    @classmethod
+    def from_transactions(cls, transactions) -> 'MerkleTree':
+        return cls([hash_leaf(transaction) for transaction in transactions])
+
+    @property
+    def root(self) -> bytes:
+        if not self.levels[0]:
+            return self.EMPTY_ROOT
+        return self.levels[-1][0]
+
+    def get_proof(self, position: int) -> list[tuple[str, str]]:
+        """
+        Gera a prova de inclusão da folha na posição informada.
+
+        :param position: A posição da transação no bloco.
+        :return: Lista de pares (lado, hash hexadecimal do irmão), da folha até a raiz.
+        """
+        if not 0 <= position < len(self.levels[0]):
+            raise IndexError(f"Posição fora da árvore: {position}")
+        proof = []
+        for level in self.levels[:-1]:
+            sibling = position ^ 1
+            if sibling < len(level):
+                side = "left" if sibling < position else "right"
+                proof.append((side, level[sibling].hex()))
+            position //= 2
+        return proof
+
+    @staticmethod
+    def verify_proof(transaction, proof: list[tuple[str, str]], root: str) -> bool:
+        """
+        Verifica uma prova de inclusão em O(log n) hashes.
+
+        :param transaction: A transação cuja inclusão será verificada.
+        :param proof: A prova gerada por `get_proof`.
+        :param root: A raiz de Merkle esperada, em hexadecimal.
+        :return: True se a transação pertence à árvore, False caso contrário.
+        """
+        current = hash_leaf(transaction)
+        for side, sibling_hex in proof:
+            sibling = bytes.fromhex(sibling_hex)
+            current = hash_node(sibling, current) if side == "left" else hash_node(current, sibling)
+        return current.hex() == root
@@ -0,0 +1,186 @@
+# blockchain/storage.py
+import mmap
+import os
+import struct
+from pathlib import Path
+
+from core.blockchain.classes import Block
+from core.blockchain.encoding import BLOCK_HEADER
+
+
+class SegmentedChainStore:
+    """
+    Armazenamento persistente e somente de acréscimo (append-only) para os blocos da blockchain.
+
+    Os blocos serializados são gravados em arquivos de segmento de tamanho limitado e um índice de largura fixa
+    guarda, para cada bloco, o segmento, o deslocamento e o tamanho do registro. A abertura lê apenas o tamanho
+    do índice (O(1)) e as leituras aleatórias são feitas por mmap, sem manter a cadeia no heap do Python.
+
+    A classe se comporta como uma sequência de `Block` (len, índice, iteração e append), podendo substituir a
+    lista em memória de `Blockchain.chain`.
+    """
+
+    INDEX_FILENAME = "index.dat"
+    SEGMENT_FILENAME = "segment_{:06d}.dat"
+    # segmento (uint32), deslocamento (uint64) e tamanho (uint32) de cada bloco
+    INDEX_ENTRY = struct.Struct("<IQI")
+    DEFAULT_SEGMENT_SIZE = 64 * 1024 * 1024
+
+    def __init__(self, directory: str, segment_size: int = DEFAULT_SEGMENT_SIZE, sync: bool = False,
+                 read_only: bool = False):
+        """
+        Abre (ou cria) o armazenamento no diretório informado.
+
+        :param directory: Diretório onde ficam o índice e os segmentos.
+        :param segment_size: Tamanho máximo, em bytes, de cada arquivo de segmento.
+        :param sync: Se True, força a gravação em disco (fsync) a cada bloco acrescentado.
+        :param read_only: Se True, abre apenas para leitura, sem truncar nem acrescentar blocos
+            (usado por leitores concorrentes, como os processos de validação paralela).
+        """
+        if segment_size <= 0:
+            raise ValueError("segment_size deve ser um inteiro positivo.")
+        self.directory = Path(directory)
+        self.segment_size = segment_size
+        self.sync = sync
+        self.read_only = read_only
+        self._maps = {}
+        self._tail = None
+
+        index_path = self.directory / self.INDEX_FILENAME
+        if read_only:
+            self._index_file = open(index_path, 'rb')
+        else:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._index_file = open(index_path, 'a+b')
+        # Descarta uma entrada de índice incompleta deixada por uma gravação interrompida
+        index_size = os.fstat(self._index_file.fileno()).st_size
+        self._count = index_size // self.INDEX_ENTRY.size
+        if index_size != self._count * self.INDEX_ENTRY.size and not read_only:
+            self._index_file.truncate(self._count * self.INDEX_ENTRY.size)
+
+        if self._count:
+            segment, offset, length = self._read_entry(self._count - 1)
+            self._segment = segment
+            self._segment_offset = offset + length
+        else:
+            self._segment = 0
+            self._segment_offset = 0
+        self._segment_file = None if read_only else self._open_segment(self._segment)
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.directory / self.SEGMENT_FILENAME.format(segment)
+
+    def _open_segment(self, segment: int):
+        segment_file = open(self._segment_path(segment), 'a+b')
+        # Bytes após o último bloco indexado não foram confirmados no índice e são descartados
+        segment_file.truncate(self._segment_offset)
+        return segment_file
+
+    def _read_entry(self, index: int) -> tuple[int, int, int]:
+        data = os.pread(self._index_file.fileno(), self.INDEX_ENTRY.size, index * self.INDEX_ENTRY.size)
+        return self.INDEX_ENTRY.unpack(data)
+
+    def _segment_map(self, segment: int, end: int) -> mmap.mmap:
+        segment_map = self._maps.get(segment)
+        if segment_map is None or len(segment_map) < end:
+            # O segmento ativo cresce com os acréscimos; o mapeamento é refeito quando fica curto
+            if segment_map is not None:
+                segment_map.close()
+            with open(self._segment_path(segment), 'rb') as file:
+                segment_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[segment] = segment_map
+        return segment_map
+
+    @staticmethod
+    def encode_block(block: Block) -> bytes:
+        return block.to_bytes()
+
+    @staticmethod
+    def decode_block(data: bytes) -> Block:
+        return Block.from_bytes(data)
+
+    def read_bytes(self, index: int) -> bytes:
+        """
+        Lê o registro serializado de um bloco sem decodificá-lo.
+
+        :param index: O índice do bloco.
+        :return: Os bytes do bloco.
+        """
+        segment, offset, length = self._read_entry(index)
+        segment_map = self._segment_map(segment, offset + length)
+        return segment_map[offset:offset + length]
+
+    def read_header(self, index: int) -> bytes:
+        """
+        Lê apenas o cabeçalho serializado de um bloco, sem ler as transações.
+
+        :param index: O índice do bloco.
+        :return: Os bytes do cabeçalho.
+        """
+        segment, offset, length = self._read_entry(index)
+        segment_map = self._segment_map(segment, offset + length)
+        return segment_map[offset:offset + BLOCK_HEADER.size]
+
+    def append(self, block: Block):
+        """
+        Acrescenta um bloco ao final do armazenamento.
+
+        :param block: O bloco a ser gravado.
+        """
+        if self.read_only:
+            raise PermissionError("O armazenamento foi aberto somente para leitura.")
+        data = self.encode_block(block)
+        if self._segment_offset and self._segment_offset + len(data) > self.segment_size:
+            self._segment_file.close()
+            self._segment += 1
+            self._segment_offset = 0
+            self._segment_file = self._open_segment(self._segment)
+
+        # O dado é gravado antes da entrada de índice, que funciona como confirmação do bloco
+        self._segment_file.write(data)
+        self._segment_file.flush()
+        entry = self.INDEX_ENTRY.pack(self._segment, self._segment_offset, len(data))
+        self._index_file.write(entry)
+        self._index_file.flush()
+        if self.sync:
+            os.fsync(self._segment_file.fileno())
+            os.fsync(self._index_file.fileno())
+
+        self._segment_offset += len(data)
+        self._count += 1
+        self._tail = block
+
+    def close(self):
+        for segment_map in self._maps.values():
+            segment_map.close()
+        self._maps.clear()
+        if self._segment_file is not None:
+            self._segment_file.close()
+        self._index_file.close()
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Índice de bloco fora da cadeia.")
+        # O último bloco é consultado a cada voto e fica em cache
+        if index == self._count - 1:
+            if self._tail is None:
+                self._tail = self.decode_block(self.read_bytes(index))
+            return self._tail
+        return self.decode_block(self.read_bytes(index))
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self[index]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
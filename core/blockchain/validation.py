@@ -0,0 +1,117 @@
+# blockchain/validation.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from core.blockchain.classes import Block
+from core.blockchain.storage import SegmentedChainStore
+
+# Armazenamentos abertos por cada processo de validação, reaproveitados entre as faixas
+_worker_stores = {}
+
+
+def block_range_source(chain, start: int, stop: int):
+    """
+    Descreve uma faixa de blocos para envio a um processo do pool.
+
+    Blocos em memória são enviados em formato binário junto com o hash guardado em cada um, que não faz parte do
+    formato binário e precisa ser conferido pelo processo.
+
+    :param chain: A sequência de blocos (lista em memória ou SegmentedChainStore).
+    :param start: Índice do primeiro bloco da faixa.
+    :param stop: Índice seguinte ao último bloco da faixa.
+    :return: ("store", diretório) ou ("blocks", lista de pares (bloco em formato binário, hash guardado)).
+    """
+    if isinstance(chain, SegmentedChainStore):
+        return "store", str(chain.directory)
+    return "blocks", [(block.to_bytes(), block.hash) for block in (chain[index] for index in range(start, stop))]
+
+
+def load_block_range(source, start: int, stop: int) -> list[Block]:
+    """
+    Carrega uma faixa contígua de blocos em um processo do pool.
+
+    :param source: Descrição da faixa produzida por `block_range_source`.
+    :param start: Índice do primeiro bloco da faixa.
+    :param stop: Índice seguinte ao último bloco da faixa.
+    :return: Os blocos da faixa.
+    """
+    kind, payload = source
+    if kind == "store":
+        store = _worker_stores.get(payload)
+        if store is None:
+            store = _worker_stores[payload] = SegmentedChainStore(payload, read_only=True)
+        return [store[index] for index in range(start, stop)]
+    blocks = []
+    for data, stored_hash in payload:
+        block = Block.from_bytes(data)
+        block.hash = stored_hash
+        blocks.append(block)
+    return blocks
+
+
+def _validate_range(source, start: int, stop: int) -> tuple[Optional[int], str, str]:
+    """
+    Valida uma faixa contígua de blocos.
+
+    :param source: Descrição da faixa produzida por `block_range_source`.
+    :param start: Índice do primeiro bloco da faixa.
+    :param stop: Índice seguinte ao último bloco da faixa.
+    :return: O primeiro índice inválido (ou None), o previous_hash do primeiro bloco e o hash do último bloco,
+        usados pelo processo pai para conferir o encadeamento entre faixas.
+    """
+    blocks = load_block_range(source, start, stop)
+    for offset, block in enumerate(blocks):
+        if not block.has_valid_hash():
+            return start + offset, blocks[0].previous_hash, blocks[-1].hash
+        if offset and block.previous_hash != blocks[offset - 1].hash:
+            return start + offset, blocks[0].previous_hash, blocks[-1].hash
+    return None, blocks[0].previous_hash, blocks[-1].hash
+
+
+class ParallelChainValidator:
+    """
+    Valida a blockchain dividindo-a em faixas de blocos distribuídas por um pool de processos.
+
+    O hash de cada bloco é conferido de forma independente; apenas o encadeamento (previous_hash) nas fronteiras
+    das faixas é conferido no processo pai.
+    """
+
+    def __init__(self, workers: Optional[int] = None, ranges_per_worker: int = 4):
+        """
+        :param workers: Número de processos (padrão: número de CPUs).
+        :param ranges_per_worker: Quantidade de faixas por processo, para equilibrar a carga.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.ranges_per_worker = ranges_per_worker
+
+    def find_first_invalid_block(self, chain, start: int = 1) -> Optional[int]:
+        """
+        Procura o primeiro bloco inválido da cadeia a partir do índice informado.
+
+        :param chain: A sequência de blocos (lista em memória ou SegmentedChainStore).
+        :param start: O primeiro índice a validar (o bloco gênese não é validado).
+        :return: O índice do primeiro bloco inválido, ou None se a faixa for válida.
+        """
+        length = len(chain)
+        if start >= length:
+            return None
+        count = length - start
+        range_size = max(1, -(-count // (self.workers * self.ranges_per_worker)))
+        bounds = [(first, min(first + range_size, length)) for first in range(start, length, range_size)]
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(_validate_range, block_range_source(chain, first, last), first, last)
+                       for first, last in bounds]
+            previous_hash = chain[start - 1].hash
+            # As faixas são percorridas em ordem, de forma que o resultado é sempre o menor índice inválido
+            for (first, _), future in zip(bounds, futures):
+                invalid_index, first_previous_hash, last_hash = future.result()
+                if first_previous_hash != previous_hash:
+                    executor.shutdown(cancel_futures=True)
+                    return first
+                if invalid_index is not None:
+                    executor.shutdown(cancel_futures=True)
+                    return invalid_index
+                previous_hash = last_hash
+        return None
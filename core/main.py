@@ -63,6 +63,9 @@ def run():
     votos_validos = sistema_votacao.validar_votos(registros_impressos)
     print(f"Votos válidos: {votos_validos}")
 
+    # Encerramento da votação: sela os votos ainda pendentes na blockchain
+    sistema_votacao.encerrar_votacao()
+
     # Criação do Boletim de Urna
     boletim_urna = sistema_votacao.gerar_boletim_urna()
 
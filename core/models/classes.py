@@ -1,5 +1,6 @@
 # models/classes.py
 from datetime import datetime
+from typing import Optional
 
 from pydantic import BaseModel, Field
 
@@ -40,6 +41,7 @@ class Voto(BaseModel):
     hash_blockchain: str = Field(..., description="Hash do registro do voto no Blockchain")
     qr_code: str = Field(..., description="QR Code contendo todas as informações do voto")
     data_hora: datetime = Field(default_factory=datetime.now, description="Data e hora do voto")
+    nonce: Optional[str] = Field(None, description="Nonce único do voto, usado para detectar votos duplicados")
 
 
 class RegistroImpresso(BaseModel):
@@ -47,6 +49,31 @@ class RegistroImpresso(BaseModel):
     data_hora: datetime = Field(..., description="Data e hora da impressão do registro")
 
 
+class RelatorioConciliacao(BaseModel):
+    total_registros: int = Field(..., description="Quantidade de registros impressos conferidos")
+    total_votos: int = Field(..., description="Quantidade de votos eletrônicos da urna")
+    conferidos: list[int] = Field(..., description="IDs dos votos cujo registro impresso confere")
+    ausentes: list[int] = Field(..., description="IDs dos votos eletrônicos sem registro impresso")
+    extras: list[int] = Field(..., description="IDs dos registros impressos sem voto eletrônico correspondente")
+    duplicados: list[int] = Field(..., description="IDs com mais de um registro impresso")
+    divergentes: list[int] = Field(..., description="IDs cujo candidato ou hash diverge do voto eletrônico")
+
+    @property
+    def valido(self) -> bool:
+        return not (self.ausentes or self.extras or self.duplicados or self.divergentes)
+
+
+class EventoProcessamento(BaseModel):
+    tipo: str = Field(..., description="Tipo do evento: 'invalido', 'duplicado' ou 'bloco_selado'")
+    indice: int = Field(..., description="Posição, no fluxo recebido, da transação que originou o evento")
+    processados: int = Field(..., description="Quantidade de transações processadas até o evento")
+    aceitos: int = Field(..., description="Quantidade de votos aceitos até o evento")
+    rejeitados: int = Field(..., description="Quantidade de votos rejeitados até o evento")
+    voto_id: Optional[int] = Field(None, description="ID do voto rejeitado por duplicidade")
+    motivo: Optional[str] = Field(None, description="Motivo da rejeição")
+    bloco: Optional[int] = Field(None, description="Índice do bloco selado")
+
+
 class BoletimUrna(BaseModel):
     id: int = Field(..., description="ID único do Boletim de Urna")
     secao: str = Field(..., description="Seção eleitoral")
@@ -57,8 +84,20 @@ class BoletimUrna(BaseModel):
     hash_final_blockchain: str = Field(..., description="Hash final do Blockchain dos votos da urna")
     hash_bu: str = Field(..., description="Hash das informações do Boletim de Urna")
     qr_code: str = Field(..., description="QR Code contendo os hashes e informações do Boletim de Urna")
-    votos: list[Voto] = Field(..., description="Lista de votos registrados na urna")
-    assinatura: str = Field(None, description="Assinatura digital do Boletim de Urna")
+    votos: Optional[list[Voto]] = Field(
+        None, description="Lista de votos registrados na urna (ausente no boletim agregado)"
+    )
+    contagem: Optional[dict[int, int]] = Field(None, description="Quantidade de votos por ID de candidato")
+    total_votos: Optional[int] = Field(None, description="Quantidade total de votos da urna")
+    raiz_merkle_blocos: Optional[str] = Field(None, description="Raiz de Merkle sobre as raízes de Merkle dos blocos")
+    assinatura: Optional[str] = Field(None, description="Assinatura digital do Boletim de Urna")
+
+
+class ResultadoValidacaoBoletim(BaseModel):
+    id: int = Field(..., description="ID do Boletim de Urna validado")
+    hash_bu: str = Field(..., description="Hash das informações do Boletim de Urna validado")
+    valido: bool = Field(..., description="Indica se o Boletim de Urna foi validado")
+    motivo: Optional[str] = Field(None, description="Motivo da rejeição do Boletim de Urna")
 
 
 class RegistroUrna(BaseModel):
@@ -73,4 +112,6 @@ class TotalizacaoVotos(BaseModel):
     data_hora: datetime = Field(..., description="Data e hora da totalização dos votos")
     votos_totalizados: list[Voto] = Field(..., description="Lista de votos totalizados")
     hash_blockchain: str = Field(..., description="Hash do Blockchain da totalização dos votos")
-    assinatura: str = Field(None, description="Assinatura digital da Totalização de Votos")
+    indice_ultimo_bloco: Optional[int] = Field(None, description="Índice do último bloco contabilizado na totalização")
+    hash_ultimo_bloco: Optional[str] = Field(None, description="Hash do último bloco contabilizado na totalização")
+    assinatura: Optional[str] = Field(None, description="Assinatura digital da Totalização de Votos")
@@ -0,0 +1,311 @@
+# processors/armazem.py
+import uuid
+from array import array
+from datetime import datetime, timedelta
+from typing import Callable, Iterator, Optional, Union
+
+from core.models.classes import Candidato, Voto
+
+EPOCA = datetime(1970, 1, 1)
+UM_MICROSSEGUNDO = timedelta(microseconds=1)
+# Indica, na coluna de QR Codes, o padrão "qrcode_{id}" gerado pela própria urna
+QR_CODE_PADRAO = -1
+TAMANHO_NONCE = 16
+TAMANHO_HASH = 32
+
+
+class _IndicePosicoes:
+    """
+    Tabela de hash de endereçamento aberto (sondagem linear) que guarda apenas posições do armazém.
+
+    As chaves não são copiadas: a comparação é feita contra as colunas do armazém, de forma que cada entrada ocupa
+    de 6 a 12 bytes em um `array`, em vez de um objeto Python por chave.
+    """
+
+    def __init__(self, hash_posicao: Callable[[int], int]):
+        """
+        :param hash_posicao: Calcula o hash da chave guardada em uma posição do armazém (usado ao redimensionar).
+        """
+        self._hash_posicao = hash_posicao
+        self._slots = array('i', bytes(8 * 4))
+        self._quantidade = 0
+
+    def procurar(self, valor_hash: int, igual: Callable[[int], bool]) -> Optional[int]:
+        """
+        Procura a posição cuja chave tem o hash informado e satisfaz `igual`.
+
+        :return: A posição no armazém, ou None se não houver.
+        """
+        mascara = len(self._slots) - 1
+        indice = valor_hash & mascara
+        while (slot := self._slots[indice]) != 0:
+            if igual(slot - 1):
+                return slot - 1
+            indice = (indice + 1) & mascara
+        return None
+
+    def inserir(self, valor_hash: int, posicao: int):
+        """
+        Insere uma posição; a unicidade das chaves é responsabilidade de quem chama.
+        """
+        if (self._quantidade + 1) * 3 > len(self._slots) * 2:
+            self._redimensionar()
+        self._inserir_slot(self._slots, valor_hash, posicao)
+        self._quantidade += 1
+
+    @staticmethod
+    def _inserir_slot(slots: array, valor_hash: int, posicao: int):
+        mascara = len(slots) - 1
+        indice = valor_hash & mascara
+        while slots[indice] != 0:
+            indice = (indice + 1) & mascara
+        slots[indice] = posicao + 1
+
+    def _redimensionar(self):
+        slots = array('i', bytes(len(self._slots) * 2 * 4))
+        for slot in self._slots:
+            if slot:
+                self._inserir_slot(slots, self._hash_posicao(slot - 1), slot - 1)
+        self._slots = slots
+
+
+class ArmazemVotos:
+    """
+    Armazenamento colunar e compacto de votos em memória.
+
+    Cada voto ocupa algumas dezenas de bytes em colunas do módulo `array`: ID, candidato, data e hora (em
+    microssegundos), hashes de localização e da blockchain, QR Code e nonce (UUID em 16 bytes). Candidatos e hashes
+    são internados em tabelas, de forma que os dados do candidato, do partido, do cargo e da eleição são guardados
+    uma única vez. Os objetos `Voto` são materializados apenas quando acessados.
+
+    Os hashes de localização e da blockchain (SHA-256 em hexadecimal) são guardados com 32 bytes crus. Votos que não
+    cabem nas colunas (data e hora com fuso horário, nonce fora do formato UUID ou hash fora do formato SHA-256) são
+    guardados integralmente, sem perda de informação.
+
+    A interface é a de uma lista somente de inclusão: `len`, índices (inclusive negativos), fatias, iteração e
+    `append`. O armazém também mantém índices de posição por nonce e por ID, sem cópias das chaves.
+    """
+
+    def __init__(self):
+        self._ids = array('q')
+        self._candidatos = array('I')
+        self._datas_hora = array('q')
+        self._hashes_localizacao = bytearray()
+        self._hashes_blockchain = bytearray()
+        self._qr_codes = array('i')
+        self._nonces = bytearray()
+        # Tabelas de internação
+        self._tabela_candidatos: list[Candidato] = []
+        self._indice_candidatos: dict[int, list[int]] = {}
+        self._tabela_qr_codes: list[str] = []
+        # Votos guardados integralmente, por posição
+        self._excecoes: dict[int, Voto] = {}
+        self._criar_indices()
+
+    def _criar_indices(self):
+        # Posições por nonce (UUID lido da coluna) e por ID (primeira ocorrência); nonces fora do formato UUID ficam
+        # em um dicionário à parte, pois não estão na coluna
+        self._indice_nonces = _IndicePosicoes(lambda posicao: self._hash_nonce(self._nonce_bytes(posicao)))
+        self._indice_ids = _IndicePosicoes(lambda posicao: hash(self._ids[posicao]))
+        self._nonces_excecoes: dict[Optional[str], int] = {}
+        for posicao in range(len(self._ids)):
+            self._indexar(posicao)
+
+    def _internar_candidato(self, candidato: Candidato) -> int:
+        posicoes = self._indice_candidatos.setdefault(candidato.id, [])
+        for posicao in posicoes:
+            if self._tabela_candidatos[posicao] is candidato or self._tabela_candidatos[posicao] == candidato:
+                return posicao
+        self._tabela_candidatos.append(candidato)
+        posicoes.append(len(self._tabela_candidatos) - 1)
+        return len(self._tabela_candidatos) - 1
+
+    @staticmethod
+    def _hash_compacto(valor) -> Optional[bytes]:
+        if not isinstance(valor, str) or len(valor) != 2 * TAMANHO_HASH:
+            return None
+        try:
+            compacto = bytes.fromhex(valor)
+        except ValueError:
+            return None
+        return compacto if compacto.hex() == valor else None
+
+    @staticmethod
+    def _nonce_compacto(nonce) -> Optional[bytes]:
+        try:
+            compacto = uuid.UUID(nonce)
+        except (TypeError, ValueError, AttributeError):
+            return None
+        return compacto.bytes if str(compacto) == nonce else None
+
+    @staticmethod
+    def _hash_nonce(nonce: bytes) -> int:
+        # Os nonces são UUIDs aleatórios: os primeiros bytes já servem de hash
+        return int.from_bytes(nonce[:8], "little")
+
+    def _nonce_bytes(self, posicao: int) -> bytes:
+        return bytes(self._nonces[posicao * TAMANHO_NONCE:(posicao + 1) * TAMANHO_NONCE])
+
+    def append(self, voto: Voto):
+        """
+        Adiciona um voto ao final do armazenamento.
+
+        :param voto: O voto.
+        """
+        posicao = len(self._ids)
+        nonce = self._nonce_compacto(voto.nonce)
+        hash_localizacao = self._hash_compacto(voto.hash_localizacao)
+        hash_blockchain = self._hash_compacto(voto.hash_blockchain)
+        if voto.data_hora.tzinfo is not None or None in (nonce, hash_localizacao, hash_blockchain):
+            self._excecoes[posicao] = voto
+            nonce = bytes(TAMANHO_NONCE)
+            hash_localizacao = hash_blockchain = bytes(TAMANHO_HASH)
+            data_hora = 0
+        else:
+            data_hora = (voto.data_hora - EPOCA) // UM_MICROSSEGUNDO
+
+        if voto.qr_code == f"qrcode_{voto.id}":
+            qr_code = QR_CODE_PADRAO
+        else:
+            qr_code = len(self._tabela_qr_codes)
+            self._tabela_qr_codes.append(voto.qr_code)
+
+        self._ids.append(voto.id)
+        self._candidatos.append(self._internar_candidato(voto.candidato))
+        self._datas_hora.append(data_hora)
+        self._hashes_localizacao += hash_localizacao
+        self._hashes_blockchain += hash_blockchain
+        self._qr_codes.append(qr_code)
+        self._nonces += nonce
+        self._indexar(posicao)
+
+    def _indexar(self, posicao: int):
+        voto = self._excecoes.get(posicao)
+        if voto is not None:
+            self._nonces_excecoes.setdefault(voto.nonce, posicao)
+        else:
+            nonce = self._nonce_bytes(posicao)
+            valor_hash = self._hash_nonce(nonce)
+            if self._indice_nonces.procurar(valor_hash,
+                                            lambda candidata: self._nonce_bytes(candidata) == nonce) is None:
+                self._indice_nonces.inserir(valor_hash, posicao)
+        voto_id = self._ids[posicao]
+        if self.posicao_por_id(voto_id) is None:
+            self._indice_ids.inserir(hash(voto_id), posicao)
+
+    def posicao_por_nonce(self, nonce: Optional[str]) -> Optional[int]:
+        """
+        Retorna a posição de um voto com o nonce informado, ou None se não houver.
+        """
+        compacto = self._nonce_compacto(nonce)
+        if compacto is None:
+            return self._nonces_excecoes.get(nonce)
+        posicao = self._indice_nonces.procurar(self._hash_nonce(compacto),
+                                               lambda candidata: self._nonce_bytes(candidata) == compacto)
+        return posicao if posicao is not None else self._nonces_excecoes.get(nonce)
+
+    def posicao_por_id(self, voto_id: int) -> Optional[int]:
+        """
+        Retorna a posição do primeiro voto com o ID informado, ou None se não houver.
+        """
+        return self._indice_ids.procurar(hash(voto_id), lambda candidata: self._ids[candidata] == voto_id)
+
+    def ids_unicos(self) -> Iterator[int]:
+        """
+        Itera sobre os IDs dos votos, na ordem da primeira ocorrência de cada ID.
+        """
+        for posicao, voto_id in enumerate(self._ids):
+            if self.posicao_por_id(voto_id) == posicao:
+                yield voto_id
+
+    @staticmethod
+    def _hash_hex(coluna: bytearray, posicao: int) -> str:
+        return coluna[posicao * TAMANHO_HASH:(posicao + 1) * TAMANHO_HASH].hex()
+
+    def _materializar(self, posicao: int) -> Voto:
+        voto = self._excecoes.get(posicao)
+        if voto is not None:
+            return voto
+        voto_id = self._ids[posicao]
+        qr_code = self._qr_codes[posicao]
+        return Voto(
+            id=voto_id,
+            candidato=self._tabela_candidatos[self._candidatos[posicao]],
+            hash_localizacao=self._hash_hex(self._hashes_localizacao, posicao),
+            hash_blockchain=self._hash_hex(self._hashes_blockchain, posicao),
+            qr_code=f"qrcode_{voto_id}" if qr_code == QR_CODE_PADRAO else self._tabela_qr_codes[qr_code],
+            data_hora=EPOCA + self._datas_hora[posicao] * UM_MICROSSEGUNDO,
+            nonce=self.nonce(posicao)
+        )
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, posicao: Union[int, slice]) -> Union[Voto, list[Voto]]:
+        if isinstance(posicao, slice):
+            return [self._materializar(indice) for indice in range(*posicao.indices(len(self)))]
+        if posicao < 0:
+            posicao += len(self)
+        if not 0 <= posicao < len(self):
+            raise IndexError("Índice de voto fora do armazenamento.")
+        return self._materializar(posicao)
+
+    def __iter__(self) -> Iterator[Voto]:
+        for posicao in range(len(self)):
+            yield self._materializar(posicao)
+
+    def id_voto(self, posicao: int) -> int:
+        """
+        Retorna o ID do voto na posição informada, sem materializá-lo.
+        """
+        return self._ids[posicao]
+
+    def nonce(self, posicao: int) -> Optional[str]:
+        """
+        Retorna o nonce do voto na posição informada, sem materializá-lo.
+        """
+        voto = self._excecoes.get(posicao)
+        if voto is not None:
+            return voto.nonce
+        return str(uuid.UUID(bytes=self._nonce_bytes(posicao)))
+
+    def exportar_estado(self) -> dict:
+        """
+        Exporta as colunas e tabelas para gravação em snapshot.
+
+        :return: Um dicionário contendo apenas tipos primitivos.
+        """
+        return {
+            "ids": self._ids.tobytes(),
+            "candidatos": self._candidatos.tobytes(),
+            "datas_hora": self._datas_hora.tobytes(),
+            "hashes_localizacao": bytes(self._hashes_localizacao),
+            "hashes_blockchain": bytes(self._hashes_blockchain),
+            "qr_codes": self._qr_codes.tobytes(),
+            "nonces": bytes(self._nonces),
+            "tabela_candidatos": [candidato.json() for candidato in self._tabela_candidatos],
+            "tabela_qr_codes": list(self._tabela_qr_codes),
+            "excecoes": {posicao: voto.json() for posicao, voto in self._excecoes.items()},
+        }
+
+    @classmethod
+    def carregar_estado(cls, estado: dict) -> 'ArmazemVotos':
+        """
+        Recria o armazenamento a partir do estado exportado por `exportar_estado`, reconstruindo os índices.
+
+        :param estado: O estado do armazenamento.
+        :return: O armazenamento restaurado.
+        """
+        armazem = cls()
+        for coluna in ("ids", "candidatos", "datas_hora", "qr_codes"):
+            getattr(armazem, f"_{coluna}").frombytes(estado[coluna])
+        armazem._nonces = bytearray(estado["nonces"])
+        armazem._tabela_candidatos = [Candidato.parse_raw(candidato) for candidato in estado["tabela_candidatos"]]
+        for posicao, candidato in enumerate(armazem._tabela_candidatos):
+            armazem._indice_candidatos.setdefault(candidato.id, []).append(posicao)
+        armazem._tabela_qr_codes = list(estado["tabela_qr_codes"])
+        armazem._excecoes = {posicao: Voto.parse_raw(voto) for posicao, voto in estado["excecoes"].items()}
+        armazem._hashes_localizacao = bytearray(estado["hashes_localizacao"])
+        armazem._hashes_blockchain = bytearray(estado["hashes_blockchain"])
+        armazem._criar_indices()
+        return armazem
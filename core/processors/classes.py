@@ -1,24 +1,80 @@
 # processors/classes.py
 import base64
 import hashlib
+import io
 import json
 import logging
+import os
+import struct
+import time
 import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, List, NamedTuple, TextIO, Union
 from typing import Optional
 
-from cryptography.exceptions import InvalidSignature
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import serialization, hashes
-from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.exceptions import InvalidTag
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from sklearn.ensemble import IsolationForest
 
-from core.blockchain.classes import Blockchain
-from core.models.classes import Voto, BoletimUrna, Candidato, RegistroImpresso, RegistroUrna, TotalizacaoVotos
+from core.blockchain.classes import Block, Blockchain, BatchPolicy
+from core.blockchain.merkle import MerkleTree, hash_leaf
+from core.blockchain.storage import SegmentedChainStore
+from core.blockchain.validation import block_range_source, load_block_range
+from core.models.classes import (Voto, BoletimUrna, Candidato, RegistroImpresso, RegistroUrna, TotalizacaoVotos,
+                                 RelatorioConciliacao, EventoProcessamento, ResultadoValidacaoBoletim)
+from core.processors.armazem import ArmazemVotos
+from core.processors.envelope import EnvelopeVoto, ENVELOPE_V2, eh_envelope_v2, de_transporte
+from core.processors.fluxo import CifraFluxo, TAMANHO_BLOCO_PADRAO
 from core.settings import ROOT_DIR
-from core.utils.datetime import datetime_to_string
+from core.utils.bloom import FiltroBloom
+from core.utils.canonical import bytes_canonicos, iterar_json_canonico
+from core.utils.signatures import PrehashedSignatureScheme, scheme_for_key, split_signature
+from core.utils.snapshot import SnapshotError, write_snapshot, read_snapshot
+
+# Prefixo de tamanho de cada bloco na exportação criptografada da blockchain
+TAMANHO_BLOCO_EXPORTADO = struct.Struct(">I")
+
+
+def contabilizar_voto(apuracao: dict, voto: Voto):
+    """
+    Atualiza uma apuração (contagem por ID de candidato) com um voto.
+
+    :param apuracao: O dicionário de contagem de votos.
+    :param voto: O voto a ser contabilizado.
+    """
+    candidato_id = voto.candidato.id
+    if candidato_id in apuracao:
+        apuracao[candidato_id]["votos"] += 1
+    else:
+        apuracao[candidato_id] = {
+            "candidato": voto.candidato,
+            "votos": 1,
+            "hash_localizacao": voto.hash_localizacao,
+            "hash_blockchain": voto.hash_blockchain,
+            "qr_code": voto.qr_code
+        }
+
+
+def mesclar_apuracoes(apuracao: dict, parcial: dict):
+    """
+    Acrescenta a uma apuração a contagem de uma apuração parcial (ver `contabilizar_voto`).
+
+    Mesclar as parciais na ordem da cadeia produz o mesmo resultado da contagem sequencial: os dados de cada
+    candidato vêm do seu primeiro voto.
+
+    :param apuracao: O dicionário de contagem de votos a atualizar.
+    :param parcial: A apuração parcial.
+    """
+    for candidato_id, dados in parcial.items():
+        if candidato_id in apuracao:
+            apuracao[candidato_id]["votos"] += dados["votos"]
+        else:
+            apuracao[candidato_id] = dict(dados)
 
 
 class IntegrityVerifier:
@@ -105,9 +161,19 @@ class CriptografiaService:
         :param chave_privada_path: O caminho para o arquivo da chave privada.
         :param chave_criptografia_path: O caminho para o arquivo da chave de criptografia.
         """
+        # Os caminhos são mantidos para que processos auxiliares possam carregar as mesmas chaves
+        self.chave_privada_path = chave_privada_path
+        self.chave_criptografia_path = chave_criptografia_path
         self.chave_privada = self._carregar_chave_privada(chave_privada_path)
         self.chave_publica = self.chave_privada.public_key()
+        # O esquema de assinatura (RSA-PSS ou Ed25519) é detectado a partir do tipo da chave do PEM
+        self.esquema_assinatura = scheme_for_key(self.chave_privada)
         self.cifra = self._carregar_cifra(chave_criptografia_path)
+        self.impressao_chaves = self._calcular_impressao_chaves(chave_criptografia_path)
+        self.envelope = EnvelopeVoto(self._ler_chave_criptografia(chave_criptografia_path))
+        self.fluxo = CifraFluxo(self._ler_chave_criptografia(chave_criptografia_path))
+        # Raízes de lote já conferidas: (raiz, assinatura) -> resultado da verificação
+        self._raizes_verificadas: dict = {}
 
     def _carregar_chave_privada(self, chave_privada_path: str):
         """
@@ -126,9 +192,42 @@ class CriptografiaService:
         :param chave_criptografia_path: O caminho para o arquivo da chave de criptografia.
         :return: A cifra carregada.
         """
+        return Fernet(self._ler_chave_criptografia(chave_criptografia_path))
+
+    def _ler_chave_criptografia(self, chave_criptografia_path: str) -> bytes:
+        """
+        Lê o conteúdo do arquivo da chave de criptografia.
+
+        :param chave_criptografia_path: O caminho para o arquivo da chave de criptografia.
+        :return: A chave de criptografia.
+        """
         with open(chave_criptografia_path, 'rb') as file:
-            chave_criptografia = file.read()
-        return Fernet(chave_criptografia)
+            return file.read()
+
+    def _calcular_impressao_chaves(self, chave_criptografia_path: str) -> str:
+        """
+        Calcula a impressão digital do par de chaves em uso (chave pública de assinatura e chave de criptografia),
+        usada para invalidar caches quando as chaves são trocadas.
+
+        :param chave_criptografia_path: O caminho para o arquivo da chave de criptografia.
+        :return: O SHA-256 das chaves, em hexadecimal.
+        """
+        impressao = hashlib.sha256(self.chave_publica.public_bytes(
+            encoding=serialization.Encoding.DER,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        ))
+        impressao.update(self._ler_chave_criptografia(chave_criptografia_path))
+        return impressao.hexdigest()
+
+    def derivar_chave(self, contexto: bytes) -> bytes:
+        """
+        Deriva da chave de criptografia uma chave independente para outro uso (HKDF-SHA256).
+
+        :param contexto: Identificador do uso da chave derivada.
+        :return: A chave derivada, com 32 bytes.
+        """
+        return HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=contexto).derive(
+            self._ler_chave_criptografia(self.chave_criptografia_path))
 
     def criptografar_dados(self, dados: str) -> str:
         """
@@ -150,37 +249,591 @@ class CriptografiaService:
         dados_criptografados_bytes = base64.b64decode(dados_criptografados)
         return self.cifra.decrypt(dados_criptografados_bytes).decode()
 
+    def criptografar_stream(self, origem: BinaryIO, destino: BinaryIO, tamanho_bloco: int = TAMANHO_BLOCO_PADRAO):
+        """
+        Criptografa o conteúdo de um arquivo em quadros autenticados, com memória constante.
+
+        :param origem: O arquivo de origem, aberto em modo binário.
+        :param destino: O arquivo de destino, aberto em modo binário.
+        :param tamanho_bloco: O tamanho do texto claro de cada quadro.
+        """
+        self.fluxo.criptografar(origem, destino, tamanho_bloco)
+
+    def descriptografar_stream(self, origem: BinaryIO, destino: BinaryIO):
+        """
+        Descriptografa um arquivo gerado por `criptografar_stream`, com memória constante.
+
+        :param origem: O arquivo criptografado, aberto em modo binário.
+        :param destino: O arquivo de destino, aberto em modo binário.
+        """
+        self.fluxo.descriptografar(origem, destino)
+
     def assinar_dados(self, dados: str) -> bytes:
         """
         Assina os dados usando a chave privada.
 
         :param dados: Os dados a serem assinados.
-        :return: A assinatura dos dados.
+        :return: A assinatura dos dados, precedida do byte que identifica o esquema de assinatura.
         """
-        return self.chave_privada.sign(
-            dados.encode(),
-            padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH),
-            hashes.SHA256()
-        )
+        assinatura = self.esquema_assinatura.sign(self.chave_privada, dados.encode())
+        return self.esquema_assinatura.tag_signature(assinatura)
 
     def verificar_assinatura(self, dados: str, assinatura: bytes) -> bool:
         """
         Verifica a assinatura dos dados usando a chave pública.
 
         :param dados: Os dados assinados.
-        :param assinatura: A assinatura dos dados.
+        :param assinatura: A assinatura dos dados, marcada com o esquema (ou RSA sem marcação).
         :return: True se a assinatura for válida, False caso contrário.
         """
         try:
-            self.chave_publica.verify(
-                assinatura,
-                dados.encode(),
-                padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH),
-                hashes.SHA256()
-            )
-            return True
-        except InvalidSignature:
+            esquema, assinatura_bruta = split_signature(assinatura, self.chave_publica)
+        except ValueError:
+            return False
+        # Uma assinatura de outro esquema nunca confere com a chave carregada
+        if esquema is not self.esquema_assinatura:
+            return False
+        return esquema.verify(self.chave_publica, assinatura_bruta, dados.encode())
+
+    def assinar_fluxo(self, partes: Iterable[bytes]) -> bytes:
+        """
+        Assina dados produzidos em partes, com o mesmo resultado de `assinar_dados` sobre a concatenação.
+
+        Esquemas que assinam o digest (RSA-PSS) consomem as partes sem guardá-las; nos demais (Ed25519), as partes
+        são reunidas antes da assinatura.
+
+        :param partes: Iterável das partes dos dados, em bytes.
+        :return: A assinatura dos dados, precedida do byte que identifica o esquema de assinatura.
+        """
+        if isinstance(self.esquema_assinatura, PrehashedSignatureScheme):
+            digest = hashlib.sha256()
+            for parte in partes:
+                digest.update(parte)
+            assinatura = self.esquema_assinatura.sign_digest(self.chave_privada, digest.digest())
+        else:
+            assinatura = self.esquema_assinatura.sign(self.chave_privada, b"".join(partes))
+        return self.esquema_assinatura.tag_signature(assinatura)
+
+    def verificar_assinatura_fluxo(self, partes: Iterable[bytes], assinatura: bytes) -> bool:
+        """
+        Verifica a assinatura de dados produzidos em partes (ver `assinar_fluxo`).
+
+        :param partes: Iterável das partes dos dados, em bytes.
+        :param assinatura: A assinatura dos dados, marcada com o esquema (ou RSA sem marcação).
+        :return: True se a assinatura for válida, False caso contrário.
+        """
+        try:
+            esquema, assinatura_bruta = split_signature(assinatura, self.chave_publica)
+        except ValueError:
+            return False
+        if esquema is not self.esquema_assinatura:
+            return False
+        if isinstance(esquema, PrehashedSignatureScheme):
+            digest = hashlib.sha256()
+            for parte in partes:
+                digest.update(parte)
+            return esquema.verify_digest(self.chave_publica, assinatura_bruta, digest.digest())
+        return esquema.verify(self.chave_publica, assinatura_bruta, b"".join(partes))
+
+    def assinar_lote(self, dados: List[str]) -> tuple[MerkleTree, bytes]:
+        """
+        Assina um lote de dados com uma única assinatura sobre a raiz de Merkle do lote.
+
+        :param dados: Os dados do lote, na ordem das folhas da árvore.
+        :return: A árvore de Merkle do lote e a assinatura da raiz.
+        """
+        arvore = MerkleTree.from_transactions(dados)
+        return arvore, self.assinar_dados(arvore.root.hex())
+
+    def verificar_voto_assinado(self, voto_assinado: dict) -> bool:
+        """
+        Verifica a assinatura de um voto assinado individualmente ou em lote (envelope v1).
+
+        Votos assinados em lote trazem a raiz do lote, a assinatura da raiz e o caminho de inclusão; a assinatura
+        de cada raiz é verificada uma única vez e os demais votos do lote custam apenas O(log n) hashes.
+
+        :param voto_assinado: O objeto contendo o voto e sua assinatura.
+        :return: True se a assinatura for válida, False caso contrário.
+        """
+        lote = voto_assinado.get("lote")
+        if lote is None:
+            return self._verificar_voto(voto_assinado["voto"], base64.b64decode(voto_assinado["assinatura"]))
+        return self._verificar_voto(voto_assinado["voto"], base64.b64decode(lote["assinatura"]),
+                                    (lote["raiz"], lote["caminho"]))
+
+    def _verificar_voto(self, voto_json: str, assinatura: bytes, lote: Optional[tuple[str, list]] = None) -> bool:
+        """
+        Verifica a assinatura de um voto, individual ou pela raiz do lote e pelo caminho de inclusão.
+
+        :param voto_json: O JSON do voto.
+        :param assinatura: A assinatura do voto ou da raiz do lote.
+        :param lote: A raiz do lote (hexadecimal) e o caminho de inclusão, se assinado em lote.
+        :return: True se a assinatura for válida, False caso contrário.
+        """
+        if lote is None:
+            return self.verificar_assinatura(voto_json, assinatura)
+
+        raiz, caminho = lote
+        if not MerkleTree.verify_proof(voto_json, caminho, raiz):
             return False
+        chave = (raiz, assinatura)
+        if chave not in self._raizes_verificadas:
+            self._raizes_verificadas[chave] = self.verificar_assinatura(raiz, assinatura)
+        return self._raizes_verificadas[chave]
+
+    def selar_voto(self, voto_json: str, assinatura: bytes, lote: Optional[tuple[str, list]] = None,
+                   formato: int = ENVELOPE_V2) -> Union[str, bytes]:
+        """
+        Monta e criptografa o envelope de um voto assinado.
+
+        :param voto_json: O JSON do voto.
+        :param assinatura: A assinatura do voto ou da raiz do lote.
+        :param lote: A raiz do lote (hexadecimal) e o caminho de inclusão, se assinado em lote.
+        :param formato: ENVELOPE_V2 (binário, padrão) ou ENVELOPE_V1 (JSON + Fernet + base64).
+        :return: Os bytes do envelope v2 ou a string base64 do envelope v1.
+        """
+        if formato == ENVELOPE_V2:
+            return self.envelope.selar(voto_json, assinatura, lote)
+        if lote is None:
+            voto_assinado = {"voto": voto_json, "assinatura": base64.b64encode(assinatura).decode()}
+        else:
+            raiz, caminho = lote
+            voto_assinado = {
+                "voto": voto_json,
+                "lote": {"raiz": raiz, "assinatura": base64.b64encode(assinatura).decode(), "caminho": caminho}
+            }
+        return self.criptografar_dados(json.dumps(voto_assinado))
+
+    def verificar_transacao(self, transacao: Union[str, bytes]) -> tuple[Optional[Voto], Optional[str]]:
+        """
+        Descriptografa uma transação (envelope v1 ou v2) e verifica a assinatura do voto contido nela.
+
+        :param transacao: O voto assinado e criptografado.
+        :return: O voto e None, se válido, ou None e o motivo da rejeição.
+        """
+        try:
+            if eh_envelope_v2(transacao):
+                voto_json, assinatura, lote = self.envelope.abrir(de_transporte(transacao))
+                valido = self._verificar_voto(voto_json, assinatura, lote)
+            else:
+                voto_assinado = json.loads(self.descriptografar_dados(transacao))
+                voto_json = voto_assinado["voto"]
+                valido = self.verificar_voto_assinado(voto_assinado)
+            if not valido:
+                return None, f"assinatura não confere - {voto_json}"
+            return Voto.parse_raw(voto_json), None
+        except (InvalidToken, InvalidTag, ValueError, KeyError, TypeError) as erro:
+            return None, f"transação ilegível - {type(erro).__name__}"
+
+
+# Serviço de criptografia de cada processo do VerificadorVotos, carregado uma única vez por processo
+_criptografia_processo: Optional[CriptografiaService] = None
+
+
+def _inicializar_processo_verificacao(chave_privada_path: str, chave_criptografia_path: str):
+    global _criptografia_processo
+    _criptografia_processo = CriptografiaService(chave_privada_path, chave_criptografia_path)
+
+
+def _verificar_lote(inicio: int, transacoes: list) -> list[tuple[int, Union[Voto, str]]]:
+    resultados = []
+    for deslocamento, transacao in enumerate(transacoes):
+        voto, motivo = _criptografia_processo.verificar_transacao(transacao)
+        resultados.append((inicio + deslocamento, voto if voto is not None else motivo))
+    return resultados
+
+
+def _verificar_boletins(boletins: list[BoletimUrna]) -> list[bool]:
+    return [_criptografia_processo.verificar_assinatura_fluxo(
+        iterar_json_canonico(boletim, exclude={'assinatura'}), base64.b64decode(boletim.assinatura))
+        for boletim in boletins]
+
+
+def _contabilizar_blocos(criptografia_service: CriptografiaService,
+                         blocos: Iterable[Block]) -> tuple[dict, list[str], list[Candidato], list[tuple]]:
+    """
+    Verifica e contabiliza os votos de uma faixa de blocos.
+
+    :param criptografia_service: Serviço de criptografia usado na verificação.
+    :param blocos: Os blocos da faixa, em ordem.
+    :return: A apuração parcial, os motivos de rejeição das transações inválidas, os candidatos internados e, para
+        cada voto válido, a entrada (digest da transação, posição do candidato, hash de localização, hash da
+        blockchain, QR Code) que alimenta o cache de votos verificados no processo principal.
+    """
+    apuracao, motivos, candidatos, entradas = {}, [], [], []
+    indice_candidatos = {}
+    for bloco in blocos:
+        for transacao in bloco.transactions:
+            voto, motivo = criptografia_service.verificar_transacao(transacao)
+            if voto is not None:
+                contabilizar_voto(apuracao, voto)
+                chave = voto.candidato.json()
+                posicao = indice_candidatos.get(chave)
+                if posicao is None:
+                    posicao = indice_candidatos[chave] = len(candidatos)
+                    candidatos.append(voto.candidato)
+                entradas.append((hash_leaf(transacao), posicao, voto.hash_localizacao, voto.hash_blockchain,
+                                 voto.qr_code))
+            else:
+                motivos.append(motivo)
+    return apuracao, motivos, candidatos, entradas
+
+
+def _contabilizar_faixa(origem, inicio: int, fim: int) -> tuple[dict, list[str], list[Candidato], list[tuple]]:
+    return _contabilizar_blocos(_criptografia_processo, load_block_range(origem, inicio, fim))
+
+
+class VerificadorVotos:
+    """
+    Motor de descriptografia e verificação de votos em paralelo.
+
+    As transações são distribuídas em lotes para um pool de processos, cada um com suas próprias chaves
+    carregadas. Os resultados são devolvidos na ordem original, para que deduplicação e registros de auditoria
+    permaneçam determinísticos no processo principal.
+    """
+
+    def __init__(self, criptografia_service: CriptografiaService, workers: Optional[int] = None,
+                 tamanho_lote: int = 256):
+        """
+        Inicializa o verificador.
+
+        :param criptografia_service: Serviço de criptografia (usado diretamente quando workers <= 1).
+        :param workers: Número de processos (padrão: número de CPUs).
+        :param tamanho_lote: Quantidade de transações enviadas a cada processo por vez.
+        """
+        self.criptografia_service = criptografia_service
+        self.workers = workers or os.cpu_count() or 1
+        self.tamanho_lote = tamanho_lote
+
+    def _lotes(self, transacoes: Iterable) -> Iterator[tuple[int, list]]:
+        lote, inicio = [], 0
+        for transacao in transacoes:
+            lote.append(transacao)
+            if len(lote) == self.tamanho_lote:
+                yield inicio, lote
+                inicio += len(lote)
+                lote = []
+        if lote:
+            yield inicio, lote
+
+    def verificar(self, transacoes: Iterable) -> Iterator[tuple[int, Union[Voto, str]]]:
+        """
+        Verifica as transações, devolvendo (índice, Voto) para votos válidos ou (índice, motivo) para rejeitados.
+
+        As transações são consumidas sob demanda, com no máximo dois lotes por processo em andamento.
+
+        :param transacoes: Iterável de votos criptografados.
+        :return: Iterador de resultados, na ordem das transações.
+        """
+        if self.workers <= 1:
+            for indice, transacao in enumerate(transacoes):
+                voto, motivo = self.criptografia_service.verificar_transacao(transacao)
+                yield indice, voto if voto is not None else motivo
+            return
+
+        for _, resultados in self.mapear(_verificar_lote, ((None, lote) for lote in self._lotes(transacoes))):
+            yield from resultados
+
+    def mapear(self, funcao: Callable, tarefas: Iterable[tuple[Any, tuple]],
+               funcao_local: Optional[Callable] = None) -> Iterator[tuple[Any, Any]]:
+        """
+        Executa uma função de verificação para cada tarefa, no pool de processos quando workers > 1.
+
+        Cada processo do pool carrega as chaves do serviço de criptografia uma única vez. As tarefas são consumidas
+        sob demanda, com no máximo duas por processo em andamento, e os resultados são devolvidos na ordem das
+        tarefas.
+
+        :param funcao: Função executada nos processos do pool; deve ser definida no nível do módulo.
+        :param tarefas: Iterável de pares (contexto, argumentos); o contexto permanece no processo principal.
+        :param funcao_local: Função equivalente executada no próprio processo quando workers <= 1 (padrão: `funcao`).
+        :return: Iterador de pares (contexto, resultado), na ordem das tarefas.
+        """
+        if self.workers <= 1:
+            funcao_local = funcao_local or funcao
+            for contexto, argumentos in tarefas:
+                yield contexto, funcao_local(*argumentos)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_inicializar_processo_verificacao,
+                                 initargs=(self.criptografia_service.chave_privada_path,
+                                           self.criptografia_service.chave_criptografia_path)) as executor:
+            em_andamento = deque()
+            for contexto, argumentos in tarefas:
+                em_andamento.append((contexto, executor.submit(funcao, *argumentos)))
+                if len(em_andamento) >= self.workers * 2:
+                    contexto, futuro = em_andamento.popleft()
+                    yield contexto, futuro.result()
+            while em_andamento:
+                contexto, futuro = em_andamento.popleft()
+                yield contexto, futuro.result()
+
+
+class TotalizadorFatiado:
+    """
+    Totalizador map-reduce: divide a cadeia em faixas de blocos distribuídas por um pool de processos.
+
+    Cada processo descriptografa, verifica e contabiliza a sua faixa em uma apuração parcial por ID de candidato;
+    as apurações parciais retornam ao processo principal, que as mescla na ordem das faixas, junto com os campos de
+    contagem de cada voto válido (com os candidatos internados), para alimentar o cache de votos verificados. O
+    resultado é idêntico ao da contagem sequencial, independentemente do número de processos.
+    """
+
+    def __init__(self, criptografia_service: CriptografiaService, workers: Optional[int] = None,
+                 faixas_por_processo: int = 4):
+        """
+        Inicializa o totalizador.
+
+        :param criptografia_service: Serviço de criptografia (usado diretamente quando workers <= 1).
+        :param workers: Número de processos (padrão: número de CPUs).
+        :param faixas_por_processo: Quantidade de faixas por processo, para equilibrar a carga.
+        """
+        self.criptografia_service = criptografia_service
+        self.workers = workers or os.cpu_count() or 1
+        self.faixas_por_processo = faixas_por_processo
+
+    def contabilizar(self, chain, inicio: int = 0, fim: Optional[int] = None,
+                     cache: Optional['CacheVotosVerificados'] = None) -> tuple[dict, list[str]]:
+        """
+        Contabiliza os votos válidos de uma faixa da cadeia.
+
+        Com um cache, os votos verificados pelos processos são acrescentados a ele, e as faixas cujas transações já
+        estão todas no cache são contabilizadas no próprio processo, sem nova verificação.
+
+        :param chain: A sequência de blocos (lista em memória ou SegmentedChainStore).
+        :param inicio: Índice do primeiro bloco a contabilizar.
+        :param fim: Índice posterior ao último bloco a contabilizar (padrão: final da cadeia).
+        :param cache: Cache de votos verificados a consultar e alimentar (opcional).
+        :return: A apuração mesclada e os motivos de rejeição das transações inválidas, na ordem da cadeia.
+        """
+        fim = len(chain) if fim is None else fim
+        apuracao, motivos = {}, []
+        if inicio >= fim:
+            return apuracao, motivos
+
+        def mesclar(parcial: dict, motivos_parciais: list[str], candidatos: list[Candidato], entradas: list[tuple]):
+            mesclar_apuracoes(apuracao, parcial)
+            motivos.extend(motivos_parciais)
+            if cache is not None:
+                for digest, candidato, hash_localizacao, hash_blockchain, qr_code in entradas:
+                    cache.adicionar(digest, VotoVerificado(candidatos[candidato], hash_localizacao, hash_blockchain,
+                                                           qr_code))
+
+        if self.workers <= 1:
+            mesclar(*_contabilizar_blocos(self.criptografia_service, (chain[indice] for indice in range(inicio, fim))))
+            return apuracao, motivos
+
+        tamanho_faixa = max(1, -(-(fim - inicio) // (self.workers * self.faixas_por_processo)))
+        faixas = [(primeiro, min(primeiro + tamanho_faixa, fim)) for primeiro in range(inicio, fim, tamanho_faixa)]
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_inicializar_processo_verificacao,
+                                 initargs=(self.criptografia_service.chave_privada_path,
+                                           self.criptografia_service.chave_criptografia_path)) as executor:
+            parciais = []
+            for primeiro, ultimo in faixas:
+                parcial = self._contabilizar_em_cache(chain, primeiro, ultimo, cache) if cache is not None else None
+                if parcial is None:
+                    parcial = executor.submit(_contabilizar_faixa, block_range_source(chain, primeiro, ultimo),
+                                              primeiro, ultimo)
+                parciais.append(parcial)
+            # As parciais são mescladas na ordem das faixas, e não na ordem de conclusão
+            for parcial in parciais:
+                if isinstance(parcial, dict):
+                    mesclar_apuracoes(apuracao, parcial)
+                else:
+                    mesclar(*parcial.result())
+        return apuracao, motivos
+
+    @staticmethod
+    def _contabilizar_em_cache(chain, inicio: int, fim: int, cache: 'CacheVotosVerificados') -> Optional[dict]:
+        """
+        Contabiliza uma faixa a partir do cache, se todas as suas transações já tiverem sido verificadas.
+
+        :return: A apuração parcial da faixa, ou None se alguma transação não estiver no cache.
+        """
+        apuracao = {}
+        for indice in range(inicio, fim):
+            for transacao in chain[indice].transactions:
+                voto = cache.obter(hash_leaf(transacao))
+                if voto is None:
+                    return None
+                contabilizar_voto(apuracao, voto)
+        return apuracao
+
+
+def ler_transacoes_ndjson(arquivo: Union[str, Path, TextIO]) -> Iterator[str]:
+    """
+    Lê transações de um arquivo com uma transação criptografada por linha, sob demanda.
+
+    Cada linha pode conter a transação em texto (base64) ou como string JSON; linhas em branco são ignoradas.
+
+    :param arquivo: O caminho do arquivo ou um arquivo de texto já aberto.
+    :return: Iterador de transações, na ordem do arquivo.
+    """
+    if isinstance(arquivo, (str, Path)):
+        with open(arquivo, 'r') as aberto:
+            yield from ler_transacoes_ndjson(aberto)
+        return
+    for linha in arquivo:
+        linha = linha.strip()
+        if linha:
+            yield json.loads(linha) if linha.startswith('"') else linha
+
+
+class VotoVerificado(NamedTuple):
+    """
+    Campos de um voto verificado usados na contagem (ver `contabilizar_voto`).
+    """
+    candidato: Candidato
+    hash_localizacao: str
+    hash_blockchain: str
+    qr_code: str
+
+
+def _compactar_hash(valor: str) -> Union[bytes, str]:
+    # Hashes SHA-256 em hexadecimal são guardados com 32 bytes crus; outros valores, como texto
+    if len(valor) == 64:
+        try:
+            return bytes.fromhex(valor)
+        except ValueError:
+            pass
+    return valor
+
+
+def _expandir_hash(valor: Union[bytes, str]) -> str:
+    return valor.hex() if isinstance(valor, bytes) else valor
+
+
+class CacheVotosVerificados:
+    """
+    Cache LRU de votos já descriptografados e verificados, indexado pelo digest da transação na blockchain.
+
+    Como os blocos são imutáveis, um voto verificado continua válido enquanto as chaves forem as mesmas; o cache só
+    é invalidado quando a impressão digital das chaves muda. Opcionalmente é persistido em disco, ao lado da cadeia,
+    autenticado com HMAC: um arquivo alterado sem a chave é descartado, e os votos voltam a ser verificados.
+
+    Cada entrada guarda apenas os campos usados na contagem, com os candidatos internados e os hashes em bytes.
+    """
+
+    # Contexto da chave de autenticação do arquivo, derivada da chave de criptografia
+    CONTEXTO_CHAVE = b"urna-cache-votos-v1"
+
+    def __init__(self, tamanho_maximo: int = 1_000_000, caminho: Optional[str] = None,
+                 chave_autenticacao: Optional[bytes] = None, audit_logger: Optional[AuditLogger] = None):
+        """
+        Inicializa o cache, carregando o arquivo persistido se ele existir.
+
+        :param tamanho_maximo: Quantidade máxima de votos mantidos em memória.
+        :param caminho: Caminho do arquivo de persistência do cache (opcional).
+        :param chave_autenticacao: Chave do HMAC do arquivo (obrigatória com caminho de persistência).
+        :param audit_logger: Logger de auditoria, para registrar o descarte de um arquivo inválido (opcional).
+        """
+        if tamanho_maximo <= 0:
+            raise ValueError("O tamanho máximo do cache deve ser um inteiro positivo.")
+        if caminho and not chave_autenticacao:
+            raise ValueError("O cache persistido exige uma chave de autenticação.")
+        self.tamanho_maximo = tamanho_maximo
+        self.caminho = Path(caminho) if caminho else None
+        self.chave_autenticacao = chave_autenticacao
+        self.impressao_chaves: Optional[str] = None
+        self._votos: OrderedDict = OrderedDict()
+        self._candidatos: list[Candidato] = []
+        self._indice_candidatos: dict[str, int] = {}
+        if self.caminho and self.caminho.exists():
+            try:
+                self.carregar()
+            except (SnapshotError, KeyError, ValueError) as erro:
+                self.limpar()
+                if audit_logger is not None:
+                    audit_logger.log(f"Cache de votos verificados descartado: {erro}")
+
+    def limpar(self):
+        """
+        Descarta todas as entradas do cache.
+        """
+        self._votos.clear()
+        self._candidatos = []
+        self._indice_candidatos = {}
+
+    def validar_chaves(self, impressao_chaves: str):
+        """
+        Descarta o cache se ele foi construído com outras chaves (rotação de chaves).
+
+        :param impressao_chaves: A impressão digital das chaves em uso.
+        """
+        if self.impressao_chaves != impressao_chaves:
+            self.limpar()
+            self.impressao_chaves = impressao_chaves
+
+    def _internar_candidato(self, candidato: Candidato) -> int:
+        chave = candidato.json()
+        posicao = self._indice_candidatos.get(chave)
+        if posicao is None:
+            posicao = self._indice_candidatos[chave] = len(self._candidatos)
+            self._candidatos.append(candidato)
+        return posicao
+
+    def obter(self, digest: bytes) -> Optional[VotoVerificado]:
+        entrada = self._votos.get(digest)
+        if entrada is None:
+            return None
+        self._votos.move_to_end(digest)
+        candidato, hash_localizacao, hash_blockchain, qr_code = entrada
+        return VotoVerificado(self._candidatos[candidato], _expandir_hash(hash_localizacao),
+                              _expandir_hash(hash_blockchain), qr_code)
+
+    def adicionar(self, digest: bytes, voto: Union[Voto, VotoVerificado]):
+        hash_localizacao = _compactar_hash(voto.hash_localizacao)
+        hash_blockchain = (hash_localizacao if voto.hash_blockchain == voto.hash_localizacao
+                           else _compactar_hash(voto.hash_blockchain))
+        self._votos[digest] = (self._internar_candidato(voto.candidato), hash_localizacao, hash_blockchain,
+                               voto.qr_code)
+        self._votos.move_to_end(digest)
+        while len(self._votos) > self.tamanho_maximo:
+            self._votos.popitem(last=False)
+
+    def __len__(self):
+        return len(self._votos)
+
+    def salvar(self):
+        """
+        Persiste o cache no arquivo configurado, preservando a ordem de uso.
+        """
+        if self.caminho is None:
+            raise ValueError("O cache não possui caminho de persistência.")
+        write_snapshot(self.caminho, {
+            "impressao_chaves": self.impressao_chaves,
+            "candidatos": [candidato.json() for candidato in self._candidatos],
+            "votos": [(digest, *entrada) for digest, entrada in self._votos.items()],
+        }, key=self.chave_autenticacao)
+
+    def carregar(self):
+        """
+        Carrega o cache a partir do arquivo configurado, conferindo o HMAC.
+
+        :raises SnapshotError: Se o arquivo estiver corrompido ou não tiver sido gravado com a mesma chave.
+        """
+        estado = read_snapshot(self.caminho, key=self.chave_autenticacao)
+        self.limpar()
+        self.impressao_chaves = estado["impressao_chaves"]
+        self._candidatos = [Candidato.parse_raw(candidato) for candidato in estado["candidatos"]]
+        self._indice_candidatos = {candidato.json(): posicao for posicao, candidato in enumerate(self._candidatos)}
+        self._votos = OrderedDict((digest, tuple(entrada)) for digest, *entrada in estado["votos"])
+        while len(self._votos) > self.tamanho_maximo:
+            self._votos.popitem(last=False)
+
+
+def _conferir_registros(pares: list[tuple[Voto, Voto]]) -> list[bool]:
+    """
+    Confere pares (voto eletrônico, voto do registro impresso) pelo candidato e pelo hash SHA-256 do voto.
+
+    :param pares: Os pares a conferir.
+    :return: Para cada par, True se o registro impresso confere com o voto eletrônico.
+    """
+    verificador = IntegrityVerifier()
+    return [
+        voto.candidato == impresso.candidato
+        and verificador.verify_integrity(impresso.json(), verificador.calculate_hash(voto.json()))
+        for voto, impresso in pares
+    ]
 
 
 class VotoService:
@@ -190,7 +843,8 @@ class VotoService:
 
     def __init__(self, criptografia_service: CriptografiaService, blockchain: Blockchain,
                  integrity_verifier: IntegrityVerifier, nonce_generator: NonceGenerator,
-                 audit_logger: AuditLogger):
+                 audit_logger: AuditLogger, assinatura_em_lote: bool = False, formato_envelope: int = ENVELOPE_V2,
+                 capacidade_filtro_nonces: Optional[int] = None):
         """
         Inicializa o serviço de votação com as dependências necessárias.
 
@@ -199,13 +853,92 @@ class VotoService:
         :param integrity_verifier: Verificador de integridade.
         :param nonce_generator: Gerador de nonce.
         :param audit_logger: Logger de auditoria.
+        :param assinatura_em_lote: Se True, os votos de cada bloco são assinados uma única vez, sobre a raiz de
+            Merkle do lote, em vez de uma assinatura por voto.
+        :param formato_envelope: Formato das transações gravadas: ENVELOPE_V2 (binário, padrão) ou ENVELOPE_V1.
+        :param capacidade_filtro_nonces: Se informada, nonces são consultados primeiro em um filtro de Bloom
+            dimensionado para essa quantidade de votos, recorrendo ao índice exato apenas quando o filtro acusa.
         """
         self.criptografia_service = criptografia_service
         self.blockchain = blockchain
         self.integrity_verifier = integrity_verifier
         self.nonce_generator = nonce_generator
         self.audit_logger = audit_logger
-        self.votos: List[Voto] = []
+        # Votos registrados, em colunas compactas; os objetos Voto são materializados sob demanda. O armazém mantém
+        # os índices por nonce e por ID, usados para detectar duplicidades e localizar votos em O(1)
+        self.votos = ArmazemVotos()
+        self._filtro_nonces = FiltroBloom(capacidade_filtro_nonces) if capacidade_filtro_nonces else None
+        # Próximo ID de voto, reservado em `preparar_voto`; o voto só entra na lista e nos índices ao ser registrado
+        self._proximo_id = 1
+        # Apuração corrente por ID de candidato, atualizada quando o bloco que contém o voto é selado
+        self.apuracao: dict = {}
+        # Votos cujas transações ainda aguardam selagem, indexados pelo digest da transação
+        self._votos_pendentes: dict = {}
+        self.blockchain.add_block_listener(self._contabilizar_bloco)
+        self.assinatura_em_lote = assinatura_em_lote
+        # Votos aguardando a assinatura do lote: pares (voto, JSON do voto)
+        self._lote_assinatura: list = []
+        self._lote_iniciado_em: Optional[float] = None
+        self.formato_envelope = formato_envelope
+
+    def _indexar_voto(self, voto: Voto):
+        """
+        Adiciona um voto à lista de votos e aos índices por nonce e por ID.
+
+        :param voto: O voto.
+        """
+        self.votos.append(voto)
+        self._indexar(voto.id, voto.nonce)
+
+    def _indexar(self, voto_id: int, nonce: Optional[str]):
+        self._proximo_id = max(self._proximo_id, voto_id + 1)
+        if self._filtro_nonces is not None and nonce is not None:
+            self._filtro_nonces.adicionar(nonce)
+
+    def _obter_voto_por_id(self, voto_id: int) -> Optional[Voto]:
+        # Como na busca sequencial anterior, um ID repetido continua apontando para o primeiro voto
+        posicao = self.votos.posicao_por_id(voto_id)
+        return self.votos[posicao] if posicao is not None else None
+
+    def _nonce_registrado(self, nonce: Optional[str]) -> bool:
+        """
+        Indica se já existe um voto registrado com o nonce informado.
+
+        :param nonce: O nonce do voto.
+        :return: True se o nonce já foi registrado, False caso contrário.
+        """
+        if self._filtro_nonces is not None and nonce is not None and nonce not in self._filtro_nonces:
+            return False
+        return self.votos.posicao_por_nonce(nonce) is not None
+
+    def _registrar_transacao(self, voto: Voto, transacao: Union[str, bytes]):
+        """
+        Adiciona a transação de um voto à blockchain, guardando o voto até que o bloco seja selado.
+
+        :param voto: O voto correspondente à transação.
+        :param transacao: O voto criptografado.
+        """
+        self._votos_pendentes[hash_leaf(transacao).hex()] = voto
+        self.blockchain.add_transaction(transacao)
+
+    def _contabilizar_bloco(self, block):
+        """
+        Contabiliza na apuração corrente os votos de um bloco recém-selado.
+
+        :param block: O bloco selado.
+        """
+        for transacao in block.transactions:
+            voto = self._votos_pendentes.pop(hash_leaf(transacao).hex(), None)
+            if voto is not None:
+                contabilizar_voto(self.apuracao, voto)
+
+    def obter_apuracao(self) -> dict:
+        """
+        Retorna a apuração corrente dos votos já selados, em O(candidatos).
+
+        :return: Um dicionário com a quantidade de votos por ID de candidato.
+        """
+        return {candidato_id: dados["votos"] for candidato_id, dados in self.apuracao.items()}
 
     def votar(self, candidato: Candidato) -> Voto:
         """
@@ -214,44 +947,151 @@ class VotoService:
         :param candidato: O candidato a ser votado.
         :return: O voto registrado.
         """
+        voto, voto_json = self.preparar_voto(candidato)
+
+        try:
+            # No modo em lote, o voto será assinado junto com os demais votos do lote, quando o lote for fechado
+            voto_criptografado = None if self.assinatura_em_lote else self.assinar_voto(voto_json)
+
+            self.registrar_voto(voto, voto_json, voto_criptografado)
+        except Exception:
+            self.descartar_voto(voto)
+            raise
+        return voto
+
+    def preparar_voto(self, candidato: Candidato) -> tuple[Voto, str]:
+        """
+        Cria o voto para um candidato, reservando o seu ID.
+
+        O voto só é adicionado à lista de votos por `registrar_voto`; se ele não for registrado, o ID deve ser
+        liberado com `descartar_voto`.
+
+        :param candidato: O candidato a ser votado.
+        :return: O voto e o seu JSON.
+        """
+        voto_id = self._proximo_id
+        self._proximo_id += 1
+
         # Cria um novo voto com os dados do candidato e informações adicionais
         voto = Voto(
-            id=len(self.votos) + 1,
+            id=voto_id,
             candidato=candidato,
             hash_localizacao=self.blockchain.chain[-1].hash,
             hash_blockchain=self.blockchain.chain[-1].hash,
-            qr_code=f"qrcode_{len(self.votos) + 1}",
+            qr_code=f"qrcode_{voto_id}",
             nonce=self.nonce_generator.generate_nonce()
         )
 
         # Converte o voto para JSON
         voto_json = voto.json()
+        return voto, voto_json
+
+    def descartar_voto(self, voto: Voto):
+        """
+        Libera o ID de um voto preparado que não foi registrado (falha na assinatura ou no registro).
+
+        O ID só é devolvido se nenhum voto posterior tiver sido preparado; caso contrário, fica uma lacuna na
+        numeração, mas o voto descartado nunca aparece na lista de votos, nos boletins ou na conciliação.
+
+        :param voto: O voto preparado por `preparar_voto`.
+        """
+        if self.votos.posicao_por_id(voto.id) is None and voto.id == self._proximo_id - 1:
+            self._proximo_id = voto.id
+
+    def assinar_voto(self, voto_json: str) -> Union[str, bytes]:
+        """
+        Assina o voto individualmente e monta o envelope criptografado.
+
+        Não altera o estado do serviço, podendo ser executado em outra thread.
 
+        :param voto_json: O JSON do voto.
+        :return: O voto assinado e criptografado.
+        """
         # Assina o voto usando o serviço de criptografia
         assinatura = self.criptografia_service.assinar_dados(voto_json)
 
-        # Cria um objeto contendo o voto e a assinatura
-        voto_assinado = {
-            "voto": voto_json,
-            "assinatura": base64.b64encode(assinatura).decode()
-        }
+        # Monta e criptografa o envelope com o voto e a assinatura
+        return self.criptografia_service.selar_voto(voto_json, assinatura, formato=self.formato_envelope)
 
-        # Criptografa o voto assinado usando o serviço de criptografia
-        voto_criptografado = self.criptografia_service.criptografar_dados(json.dumps(voto_assinado))
+    def registrar_voto(self, voto: Voto, voto_json: str, voto_criptografado: Union[str, bytes, None] = None):
+        """
+        Registra na blockchain um voto preparado por `preparar_voto`.
 
-        # Adiciona o voto à lista de votos
-        self.votos.append(voto)
+        :param voto: O voto.
+        :param voto_json: O JSON do voto.
+        :param voto_criptografado: O voto assinado por `assinar_voto`; deve ser None no modo de assinatura em lote.
+        """
+        if self.assinatura_em_lote:
+            self._indexar_voto(voto)
+            self._adicionar_ao_lote(voto, voto_json)
+        else:
+            if voto_criptografado is None:
+                raise ValueError("O voto precisa estar assinado fora do modo de assinatura em lote.")
 
-        # Adiciona o voto criptografado como uma transação na blockchain
-        self.blockchain.add_transaction(voto_criptografado)
+            # Adiciona o voto criptografado como uma transação na blockchain e o voto à lista de votos
+            self._registrar_transacao(voto, voto_criptografado)
+            self._indexar_voto(voto)
 
-        # Minera as transações pendentes na blockchain
-        self.blockchain.mine_pending_transactions()
+            # Sela um novo bloco apenas quando a política de agrupamento da blockchain exigir
+            self.blockchain.mine_if_due()
 
         # Registra o voto no logger de auditoria
         self.audit_logger.log(f"Voto registrado: {voto}")
 
-        return voto
+    def _adicionar_ao_lote(self, voto: Voto, voto_json: str):
+        """
+        Acumula um voto no lote de assinatura, fechando o lote quando a política de agrupamento exigir.
+
+        :param voto: O voto.
+        :param voto_json: O JSON do voto, que será a folha da árvore de Merkle do lote.
+        """
+        if not self._lote_assinatura:
+            self._lote_iniciado_em = time.monotonic()
+        self._lote_assinatura.append((voto, voto_json))
+        if self.blockchain.batch_policy.is_due(len(self._lote_assinatura), self._lote_iniciado_em):
+            self._fechar_lote()
+
+    def _fechar_lote(self):
+        """
+        Assina a raiz de Merkle do lote, criptografa cada voto com seu caminho de inclusão e sela o bloco.
+        """
+        if not self._lote_assinatura:
+            return
+        arvore, assinatura = self.criptografia_service.assinar_lote(
+            [voto_json for _, voto_json in self._lote_assinatura])
+        raiz = arvore.root.hex()
+        for posicao, (voto, voto_json) in enumerate(self._lote_assinatura):
+            voto_criptografado = self.criptografia_service.selar_voto(
+                voto_json, assinatura, (raiz, arvore.get_proof(posicao)), formato=self.formato_envelope)
+            self._registrar_transacao(voto, voto_criptografado)
+        self._lote_assinatura = []
+        self._lote_iniciado_em = None
+        # Cada lote assinado corresponde a exatamente um bloco
+        self.blockchain.mine_pending_transactions()
+        self.audit_logger.log(f"Lote de votos assinado: raiz {raiz}")
+
+    def selar_se_vencido(self) -> bool:
+        """
+        Sela o lote de assinatura ou as transações pendentes se o prazo da política de agrupamento tiver vencido.
+
+        A política só é consultada a cada voto; sem novos votos, este método deve ser chamado periodicamente (o
+        pipeline assíncrono faz isso) para que os votos pendentes sejam selados após `max_interval_ms`.
+
+        :return: True se um bloco foi selado, False caso contrário.
+        """
+        if self._lote_assinatura:
+            if self.blockchain.batch_policy.is_due(len(self._lote_assinatura), self._lote_iniciado_em):
+                self._fechar_lote()
+                return True
+            return False
+        return self.blockchain.mine_if_due()
+
+    def selar_pendentes(self):
+        """
+        Fecha o lote de assinatura em aberto e sela todas as transações pendentes na blockchain.
+        """
+        self._fechar_lote()
+        self.blockchain.flush()
 
     def validar_votos(self, registros_impressos: List[RegistroImpresso]) -> bool:
         """
@@ -262,7 +1102,7 @@ class VotoService:
         """
         for registro in registros_impressos:
             # Procura o voto correspondente ao registro impresso
-            voto = next((v for v in self.votos if v.id == registro.voto.id), None)
+            voto = self._obter_voto_por_id(registro.voto.id)
 
             # Verifica se o voto existe e se os atributos relevantes correspondem ao registro impresso
             if voto is None or voto.id != registro.voto.id or voto.candidato != registro.voto.candidato:
@@ -277,44 +1117,238 @@ class VotoService:
 
         return True
 
-    def processar_votos(self, votos: List[Voto]):
+    def conciliar_registros(self, registros_impressos: Iterable[RegistroImpresso], workers: Optional[int] = None,
+                            tamanho_lote: int = 1024) -> RelatorioConciliacao:
+        """
+        Concilia em lote os registros impressos com os votos eletrônicos, apontando todas as divergências.
+
+        Os registros são associados aos votos pelo índice de IDs e os hashes são conferidos em lotes, em paralelo
+        quando workers > 1, com no máximo dois lotes por processo em andamento.
+
+        :param registros_impressos: Iterável de registros impressos (consumido sob demanda).
+        :param workers: Número de processos para conferir os hashes (padrão: no próprio processo).
+        :param tamanho_lote: Quantidade de registros enviados a cada processo por vez.
+        :return: O relatório de conciliação.
+        """
+        conferidos, extras, duplicados, divergentes = [], [], [], []
+        vistos = set()
+        total_registros = 0
+
+        def consolidar(ids: list, resultados: list):
+            for voto_id, confere in zip(ids, resultados):
+                (conferidos if confere else divergentes).append(voto_id)
+
+        def lotes():
+            nonlocal total_registros
+            ids, pares = [], []
+            for registro in registros_impressos:
+                total_registros += 1
+                voto_id = registro.voto.id
+                if voto_id in vistos:
+                    duplicados.append(voto_id)
+                    continue
+                vistos.add(voto_id)
+                voto = self._obter_voto_por_id(voto_id)
+                if voto is None:
+                    extras.append(voto_id)
+                    continue
+                ids.append(voto_id)
+                pares.append((voto, registro.voto))
+                if len(pares) == tamanho_lote:
+                    yield ids, pares
+                    ids, pares = [], []
+            if pares:
+                yield ids, pares
+
+        verificador = VerificadorVotos(self.criptografia_service, workers or 1)
+        for ids, resultados in verificador.mapear(_conferir_registros, ((ids, (pares,)) for ids, pares in lotes())):
+            consolidar(ids, resultados)
+
+        relatorio = RelatorioConciliacao(
+            total_registros=total_registros,
+            total_votos=len(self.votos),
+            conferidos=conferidos,
+            ausentes=[voto_id for voto_id in self.votos.ids_unicos() if voto_id not in vistos],
+            extras=extras,
+            duplicados=duplicados,
+            divergentes=divergentes
+        )
+        self.audit_logger.log(
+            f"Conciliação de registros impressos: {len(conferidos)} conferidos, {len(relatorio.ausentes)} ausentes, "
+            f"{len(extras)} extras, {len(duplicados)} duplicados, {len(divergentes)} divergentes")
+        return relatorio
+
+    def encerrar_votacao(self):
+        """
+        Encerra a votação selando as transações que ainda estejam pendentes na blockchain.
+        """
+        self.selar_pendentes()
+        self.audit_logger.log(f"Votação encerrada: {len(self.blockchain.chain)} blocos, "
+                              f"hash final {self.blockchain.chain[-1].hash}")
+
+    def exportar_estado(self) -> dict:
+        """
+        Exporta o estado do serviço de votação para gravação em snapshot.
+
+        :return: Um dicionário contendo apenas tipos primitivos.
+        """
+        return {
+            "votos": self.votos.exportar_estado(),
+            "apuracao": {
+                candidato_id: dict(dados, candidato=dados["candidato"].json())
+                for candidato_id, dados in self.apuracao.items()
+            },
+            "votos_pendentes": {digest: voto.json() for digest, voto in self._votos_pendentes.items()},
+            "lote_assinatura": [voto_json for _, voto_json in self._lote_assinatura],
+        }
+
+    def carregar_estado(self, estado: dict):
+        """
+        Restaura o estado exportado por `exportar_estado`.
+
+        :param estado: O estado do serviço de votação.
+        """
+        if isinstance(estado["votos"], list):
+            # Snapshots anteriores ao armazenamento colunar guardam a lista de votos em JSON
+            self.votos = ArmazemVotos()
+            for voto_json in estado["votos"]:
+                self.votos.append(Voto.parse_raw(voto_json))
+        else:
+            self.votos = ArmazemVotos.carregar_estado(estado["votos"])
+        if self._filtro_nonces is not None:
+            self._filtro_nonces = FiltroBloom(max(len(self.votos), self._filtro_nonces.capacidade))
+        for posicao in range(len(self.votos)):
+            nonce = self.votos.nonce(posicao) if self._filtro_nonces is not None else None
+            self._indexar(self.votos.id_voto(posicao), nonce)
+        self.apuracao = {
+            candidato_id: dict(dados, candidato=Candidato.parse_raw(dados["candidato"]))
+            for candidato_id, dados in estado["apuracao"].items()
+        }
+        self._votos_pendentes = {
+            digest: Voto.parse_raw(voto_json) for digest, voto_json in estado["votos_pendentes"].items()
+        }
+        self._lote_assinatura = [(Voto.parse_raw(voto_json), voto_json) for voto_json in estado["lote_assinatura"]]
+        self._lote_iniciado_em = time.monotonic() if self._lote_assinatura else None
+
+    def recuperar_blocos(self, inicio: int) -> int:
+        """
+        Incorpora os votos dos blocos selados a partir de um índice, gravados depois do estado restaurado.
+
+        Apenas as transações desses blocos são descriptografadas e verificadas. Votos pendentes ou em lote no
+        estado restaurado são contabilizados; votos desconhecidos também são adicionados aos votos registrados.
+
+        :param inicio: Índice do primeiro bloco posterior ao estado restaurado.
+        :return: A quantidade de votos incorporados.
+        """
+        lote = {voto.nonce: posicao for posicao, (voto, _) in enumerate(self._lote_assinatura)}
+        selados_do_lote = set()
+        incorporados = 0
+        for indice in range(inicio, len(self.blockchain.chain)):
+            for transacao in self.blockchain.chain[indice].transactions:
+                voto, motivo = self.criptografia_service.verificar_transacao(transacao)
+                if voto is None:
+                    self.audit_logger.log(f"Transação inválida no bloco {indice} ignorada na recuperação: {motivo}")
+                    continue
+                pendente = self._votos_pendentes.pop(hash_leaf(transacao).hex(), None)
+                if pendente is not None:
+                    voto = pendente
+                elif voto.nonce in lote and voto.nonce not in selados_do_lote:
+                    selados_do_lote.add(voto.nonce)
+                elif not self._nonce_registrado(voto.nonce):
+                    self._indexar_voto(voto)
+                else:
+                    self.audit_logger.log(f"Voto duplicado no bloco {indice} ignorado na recuperação: {voto.id}")
+                    continue
+                contabilizar_voto(self.apuracao, voto)
+                incorporados += 1
+        if selados_do_lote:
+            self._lote_assinatura = [(voto, voto_json) for voto, voto_json in self._lote_assinatura
+                                     if voto.nonce not in selados_do_lote]
+            self._lote_iniciado_em = time.monotonic() if self._lote_assinatura else None
+        return incorporados
+
+    def processar_votos(self, votos: Iterable[Union[str, bytes]], workers: Optional[int] = None):
         """
         Processa os votos recebidos.
 
-        :param votos: Lista de votos a serem processados.
+        :param votos: Votos criptografados a serem processados (envelopes v1 ou v2, estes em bytes ou em base64).
+        :param workers: Número de processos para descriptografar e verificar os votos em paralelo
+            (padrão: no próprio processo).
+        """
+        for _ in self.processar_votos_stream(votos, workers):
+            pass
+
+    def processar_votos_stream(self, votos: Iterable[Union[str, bytes]], workers: Optional[int] = None,
+                               selar_a_cada: Optional[int] = None) -> Iterator[EventoProcessamento]:
         """
-        for voto_criptografado in votos:
-            # Descriptografa o voto usando o serviço de criptografia
-            voto_descriptografado = self.criptografia_service.descriptografar_dados(voto_criptografado)
+        Processa votos recebidos de qualquer iterável (arquivo NDJSON, fila, gerador), com memória constante.
+
+        Apenas as transações em verificação ficam em memória. As transações aceitas são seladas em um bloco a cada
+        `selar_a_cada` votos aceitos e ao final do processamento.
 
-            # Converte o voto descriptografado de JSON para um objeto Python
-            voto_assinado = json.loads(voto_descriptografado)
+        :param votos: Iterável de votos criptografados (consumido sob demanda).
+        :param workers: Número de processos para descriptografar e verificar os votos em paralelo
+            (padrão: no próprio processo).
+        :param selar_a_cada: Quantidade de votos aceitos por bloco selado (padrão: um único bloco ao final).
+        :return: Iterador de eventos: "invalido" e "duplicado" para cada rejeição e "bloco_selado" a cada bloco.
+        """
+        # Transações já entregues ao verificador e ainda sem resultado, na mesma ordem dos resultados
+        em_verificacao = deque()
 
-            # Extrai o JSON do voto e a assinatura do objeto voto_assinado
-            voto_json = voto_assinado["voto"]
-            assinatura = base64.b64decode(voto_assinado["assinatura"])
+        def transacoes():
+            for transacao in votos:
+                em_verificacao.append(transacao)
+                yield transacao
 
-            # Verifica a assinatura do voto usando o serviço de criptografia
-            if self.criptografia_service.verificar_assinatura(voto_json, assinatura):
-                # Converte o JSON do voto para um objeto Voto
-                voto = Voto.parse_raw(voto_json)
+        processados = aceitos = rejeitados = nao_selados = 0
 
-                # Verifica se o nonce do voto já existe na lista de votos
-                if voto.nonce not in [v.nonce for v in self.votos]:
+        def evento(tipo: str, indice: int, **kwargs) -> EventoProcessamento:
+            return EventoProcessamento(tipo=tipo, indice=indice, processados=processados, aceitos=aceitos,
+                                       rejeitados=rejeitados, **kwargs)
+
+        indice = -1
+        for indice, resultado in VerificadorVotos(self.criptografia_service, workers or 1).verificar(transacoes()):
+            transacao = em_verificacao.popleft()
+            processados += 1
+            if isinstance(resultado, Voto):
+                try:
+                    # Envelopes v2 recebidos em base64 são gravados na blockchain em binário
+                    voto_criptografado = de_transporte(transacao)
+                except ValueError as erro:
+                    resultado = f"transação ilegível - {type(erro).__name__}"
+            if isinstance(resultado, Voto):
+                voto = resultado
+
+                # Verifica se o nonce do voto já foi registrado
+                if not self._nonce_registrado(voto.nonce):
                     # Adiciona o voto à lista de votos
-                    self.votos.append(voto)
+                    self._indexar_voto(voto)
 
                     # Adiciona o voto criptografado como uma transação na blockchain
-                    self.blockchain.add_transaction(voto_criptografado)
+                    self._registrar_transacao(voto, voto_criptografado)
+                    aceitos += 1
+                    nao_selados += 1
                 else:
                     # Registra uma tentativa de voto duplicado no logger de auditoria
                     self.audit_logger.log(f"Tentativa de voto duplicado: {voto}")
+                    rejeitados += 1
+                    yield evento("duplicado", indice, voto_id=voto.id, motivo="nonce já registrado")
             else:
                 # Registra um voto inválido no logger de auditoria
-                self.audit_logger.log(f"Voto inválido: assinatura não confere - {voto_json}")
+                self.audit_logger.log(f"Voto inválido: {resultado}")
+                rejeitados += 1
+                yield evento("invalido", indice, motivo=resultado)
+
+            if selar_a_cada and nao_selados >= selar_a_cada:
+                self.blockchain.mine_pending_transactions()
+                nao_selados = 0
+                yield evento("bloco_selado", indice, bloco=self.blockchain.chain[-1].index)
 
         # Minera as transações pendentes na blockchain
+        selou = bool(self.blockchain.pending_transactions)
         self.blockchain.mine_pending_transactions()
+        if selou:
+            yield evento("bloco_selado", indice, bloco=self.blockchain.chain[-1].index)
 
 
 class BoletimUrnaService:
@@ -322,55 +1356,161 @@ class BoletimUrnaService:
     Serviço responsável por gerenciar os boletins de urna.
     """
 
-    def __init__(self, criptografia_service: CriptografiaService, voto_service: VotoService):
+    def __init__(self, criptografia_service: CriptografiaService, voto_service: VotoService,
+                 boletim_agregado: bool = False):
         """
         Inicializa o serviço de boletim de urna com as dependências necessárias.
 
         :param criptografia_service: Serviço de criptografia.
         :param voto_service: Serviço de votação.
+        :param boletim_agregado: Se True, os boletins trazem a contagem por candidato, o hash final e a raiz de
+            Merkle dos blocos em vez da lista de votos, com tamanho independente do número de eleitores.
         """
         self.criptografia_service = criptografia_service
         self.voto_service = voto_service
+        self.boletim_agregado = boletim_agregado
         self.boletins_urna: List[BoletimUrna] = []
+        # Índices dos boletins registrados por ID e por hash do boletim (o primeiro registrado, em caso de repetição)
+        self._boletins_por_id: dict = {}
+        self._boletins_por_hash: dict = {}
 
-    def gerar_boletim_urna(self) -> BoletimUrna:
+    def gerar_boletim_urna(self, destino: Optional[BinaryIO] = None) -> BoletimUrna:
         """
         Gera um novo boletim de urna com base nos votos registrados.
 
+        O JSON canônico do boletim é produzido uma única vez, em partes, e usado ao mesmo tempo para a assinatura
+        e, se houver destino, para a gravação criptografada (ver `exportar_boletim_criptografado`).
+
+        :param destino: Arquivo, aberto em modo binário, para gravar o boletim criptografado (opcional).
         :return: O boletim de urna gerado.
         """
+        # Garante que votos ainda não selados estejam cobertos pelo hash final do boletim
+        self.voto_service.selar_pendentes()
+        blockchain = self.voto_service.blockchain
+
         # Cria um novo boletim de urna com os dados relevantes
-        boletim = BoletimUrna(
+        campos = dict(
             id=len(self.boletins_urna) + 1,
             secao="Seção XYZ",
             zona="Zona 123",
             municipio="Município ABC",
             estado="Estado MN",
             data_hora=datetime.now(),
-            hash_final_blockchain=self.voto_service.blockchain.chain[-1].hash,
-            hash_bu=self.voto_service.blockchain.chain[-1].hash,
+            hash_final_blockchain=blockchain.chain[-1].hash,
+            hash_bu=blockchain.chain[-1].hash,
             qr_code=f"qrcode_bu_{len(self.boletins_urna) + 1}",
-            votos=self.voto_service.votos
         )
+        if self.boletim_agregado:
+            contagem = self.voto_service.obter_apuracao()
+            boletim = BoletimUrna(**campos, contagem=contagem, total_votos=sum(contagem.values()),
+                                  raiz_merkle_blocos=blockchain.get_chain_merkle_root())
+        else:
+            boletim = BoletimUrna(**campos, votos=list(self.voto_service.votos))
 
-        # Converte o boletim para um dicionário, excluindo os campos None
-        boletim_dict = boletim.dict(exclude_none=True)
-
-        # Assina o boletim usando o serviço de criptografia
-        assinatura_boletim = self.criptografia_service.assinar_dados(
-            json.dumps(boletim_dict, default=datetime_to_string, sort_keys=True))
+        escritor = self.criptografia_service.fluxo.escritor(destino) if destino is not None else None
 
-        # Adiciona a assinatura codificada em base64 ao boletim
-        boletim.assinatura = base64.b64encode(assinatura_boletim).decode()
+        def partes():
+            for parte in iterar_json_canonico(boletim, exclude={'assinatura'}):
+                if escritor is not None:
+                    escritor.write(parte)
+                yield parte
 
-        # Criptografa o boletim usando o serviço de criptografia
-        boletim_criptografado = self.criptografia_service.criptografar_dados(boletim.json())
+        try:
+            # Assina o boletim usando o serviço de criptografia
+            assinatura_boletim = self.criptografia_service.assinar_fluxo(partes())
+
+            # Adiciona a assinatura codificada em base64 ao boletim
+            boletim.assinatura = base64.b64encode(assinatura_boletim).decode()
+            if escritor is not None:
+                escritor.write(b"\n" + boletim.assinatura.encode())
+                escritor.close()
+        except Exception:
+            if escritor is not None:
+                escritor.abortar()
+            raise
 
         # Adiciona o boletim à lista de boletins de urna
-        self.boletins_urna.append(boletim)
+        self._registrar_boletim(boletim)
 
         return boletim
 
+    def exportar_boletim_criptografado(self, boletim: BoletimUrna, destino: BinaryIO):
+        """
+        Grava o boletim de urna criptografado, serializando e criptografando um voto por vez.
+
+        O conteúdo é o JSON canônico assinado (sem a assinatura) seguido de uma linha com a assinatura, de forma
+        que o boletim completo nunca é montado em memória.
+
+        :param boletim: O boletim de urna.
+        :param destino: O arquivo de destino, aberto em modo binário.
+        """
+        with self.criptografia_service.fluxo.escritor(destino) as escritor:
+            for parte in iterar_json_canonico(boletim, exclude={'assinatura'}):
+                escritor.write(parte)
+            if boletim.assinatura is not None:
+                escritor.write(b"\n" + boletim.assinatura.encode())
+
+    def importar_boletim_criptografado(self, origem: BinaryIO) -> BoletimUrna:
+        """
+        Lê um boletim de urna gravado por `exportar_boletim_criptografado` ou por `gerar_boletim_urna`.
+
+        :param origem: O arquivo criptografado, aberto em modo binário.
+        :return: O boletim de urna.
+        """
+        conteudo, _, assinatura = self.criptografia_service.fluxo.leitor(origem).read().partition(b"\n")
+        boletim = BoletimUrna.parse_raw(conteudo)
+        if assinatura:
+            boletim.assinatura = assinatura.decode()
+        return boletim
+
+    def exportar_estado(self) -> dict:
+        """
+        Exporta os boletins de urna gerados para gravação em snapshot.
+
+        :return: Um dicionário contendo apenas tipos primitivos.
+        """
+        return {"boletins_urna": [boletim.json(exclude_none=True) for boletim in self.boletins_urna]}
+
+    def carregar_estado(self, estado: dict):
+        """
+        Restaura os boletins de urna exportados por `exportar_estado`.
+
+        :param estado: O estado do serviço de boletins de urna.
+        """
+        self.boletins_urna = []
+        self._boletins_por_id = {}
+        self._boletins_por_hash = {}
+        for boletim_json in estado["boletins_urna"]:
+            self._registrar_boletim(BoletimUrna.parse_raw(boletim_json))
+
+    def _registrar_boletim(self, boletim: BoletimUrna):
+        """
+        Adiciona um boletim à lista de boletins de urna e aos índices por ID e por hash.
+
+        :param boletim: O boletim de urna.
+        """
+        self.boletins_urna.append(boletim)
+        self._boletins_por_id.setdefault(boletim.id, boletim)
+        self._boletins_por_hash.setdefault(boletim.hash_bu, boletim)
+
+    def obter_boletim(self, boletim_id: int) -> Optional[BoletimUrna]:
+        """
+        Localiza um boletim de urna registrado pelo ID, em O(1).
+
+        :param boletim_id: O ID do boletim.
+        :return: O boletim, ou None se não houver boletim registrado com esse ID.
+        """
+        return self._boletins_por_id.get(boletim_id)
+
+    def obter_boletim_por_hash(self, hash_bu: str) -> Optional[BoletimUrna]:
+        """
+        Localiza um boletim de urna registrado pelo hash do boletim, em O(1).
+
+        :param hash_bu: O hash do boletim.
+        :return: O boletim, ou None se não houver boletim registrado com esse hash.
+        """
+        return self._boletins_por_hash.get(hash_bu)
+
     def validar_boletim_urna(self, boletim_impresso: BoletimUrna) -> bool:
         """
         Valida um boletim de urna impresso comparando-o com o boletim de urna eletrônico correspondente.
@@ -379,24 +1519,79 @@ class BoletimUrnaService:
         :return: True se o boletim de urna for válido, False caso contrário.
         """
         # Procura o boletim de urna eletrônico correspondente ao boletim impresso
-        boletim_eletronico = next((b for b in self.boletins_urna if b.id == boletim_impresso.id), None)
+        boletim_eletronico = self.obter_boletim(boletim_impresso.id)
 
         # Se o boletim eletrônico não for encontrado, retorna False
         if boletim_eletronico is None:
             return False
 
-        # Converte o boletim eletrônico para um dicionário, excluindo o campo 'assinatura'
-        boletim_dict = boletim_eletronico.dict(exclude_none=True, exclude={'assinatura'})
-
         # Decodifica a assinatura do boletim eletrônico a partir da base64
         assinatura_boletim = base64.b64decode(boletim_eletronico.assinatura)
 
-        # Verifica a assinatura do boletim usando o serviço de criptografia
-        return self.criptografia_service.verificar_assinatura(
-            json.dumps(boletim_dict, default=datetime_to_string, sort_keys=True),
+        # Verifica a assinatura sobre o JSON canônico do boletim, excluindo o campo 'assinatura'
+        return self.criptografia_service.verificar_assinatura_fluxo(
+            iterar_json_canonico(boletim_eletronico, exclude={'assinatura'}),
             assinatura_boletim
         )
 
+    def _verificar_boletins(self, boletins: list[BoletimUrna]) -> list[bool]:
+        return [self.criptografia_service.verificar_assinatura_fluxo(
+            iterar_json_canonico(boletim, exclude={'assinatura'}), base64.b64decode(boletim.assinatura))
+            for boletim in boletins]
+
+    def validar_boletins_urna(self, boletins: Iterable[BoletimUrna], workers: Optional[int] = None,
+                              tamanho_lote: int = 64) -> List[ResultadoValidacaoBoletim]:
+        """
+        Valida em lote os boletins de urna recebidos, com um resultado por boletim.
+
+        A assinatura de cada boletim é verificada sobre o seu JSON canônico, em paralelo quando workers > 1. Se
+        houver um boletim registrado com o mesmo ID, o conteúdo recebido também deve ser idêntico ao registrado.
+
+        :param boletins: Iterável de boletins de urna (consumido sob demanda).
+        :param workers: Número de processos para verificar as assinaturas (padrão: no próprio processo).
+        :param tamanho_lote: Quantidade de boletins enviados a cada processo por vez.
+        :return: Os resultados, na ordem dos boletins recebidos.
+        """
+        resultados = []
+
+        def consolidar(lote: list, assinaturas_validas: list):
+            for (posicao, boletim), assinatura_valida in zip(lote, assinaturas_validas):
+                motivo = None
+                if not assinatura_valida:
+                    motivo = "assinatura inválida"
+                else:
+                    registrado = self.obter_boletim(boletim.id)
+                    if registrado is not None and (
+                            bytes_canonicos(registrado, exclude={'assinatura'})
+                            != bytes_canonicos(boletim, exclude={'assinatura'})):
+                        motivo = "divergente do boletim registrado"
+                resultado = ResultadoValidacaoBoletim(id=boletim.id, hash_bu=boletim.hash_bu, valido=motivo is None)
+                if motivo is not None:
+                    resultado.motivo = motivo
+                resultados[posicao] = resultado
+
+        def lotes():
+            lote = []
+            for boletim in boletins:
+                resultados.append(None)
+                if boletim.assinatura is None:
+                    resultados[-1] = ResultadoValidacaoBoletim(id=boletim.id, hash_bu=boletim.hash_bu, valido=False,
+                                                               motivo="assinatura ausente")
+                    continue
+                lote.append((len(resultados) - 1, boletim))
+                if len(lote) == tamanho_lote:
+                    yield lote
+                    lote = []
+            if lote:
+                yield lote
+
+        verificador = VerificadorVotos(self.criptografia_service, workers or 1)
+        tarefas = ((lote, ([boletim for _, boletim in lote],)) for lote in lotes())
+        for lote, assinaturas_validas in verificador.mapear(_verificar_boletins, tarefas, self._verificar_boletins):
+            consolidar(lote, assinaturas_validas)
+
+        return resultados
+
 
 class TotalizacaoVotosService:
     """
@@ -404,80 +1599,161 @@ class TotalizacaoVotosService:
     """
 
     def __init__(self, criptografia_service: CriptografiaService, voto_service: VotoService,
-                 audit_logger: AuditLogger):
+                 audit_logger: AuditLogger, cache_votos: Optional[CacheVotosVerificados] = None):
         """
         Inicializa o serviço de totalização de votos com as dependências necessárias.
 
         :param criptografia_service: Serviço de criptografia.
         :param voto_service: Serviço de votação.
         :param audit_logger: Logger de auditoria.
+        :param cache_votos: Cache de votos já verificados (padrão: cache em memória).
         """
         self.criptografia_service = criptografia_service
         self.voto_service = voto_service
         self.audit_logger = audit_logger
+        self.cache_votos = cache_votos if cache_votos is not None else CacheVotosVerificados()
+        # Apuração acumulada e marca d'água (último bloco contabilizado) da totalização incremental
+        self._tally: dict = {}
+        self._indice_marca = -1
+        self._hash_marca: Optional[str] = None
+        self._impressao_marca: Optional[str] = None
+        self._totalizacoes = 0
 
-    def totalizar_votos(self) -> TotalizacaoVotos:
+    def totalizar_votos(self, workers: Optional[int] = None) -> TotalizacaoVotos:
         """
         Totaliza os votos e retorna o resultado da totalização.
 
+        A totalização é incremental: o serviço mantém a apuração acumulada e a marca d'água (índice e hash do último
+        bloco contabilizado), e cada chamada descriptografa, verifica e contabiliza apenas os blocos selados depois
+        da marca. Se o bloco da marca não estiver mais na cadeia (cadeia substituída) ou as chaves tiverem mudado,
+        a apuração é descartada e refeita desde o início.
+
+        :param workers: Número de processos para descriptografar e verificar os votos em paralelo
+            (padrão: no próprio processo).
         :return: O resultado da totalização dos votos.
         """
-        tally = self._contabilizar_votos()
-        votos_totalizados = self._gerar_votos_totalizados(tally)
+        self._atualizar_tally(workers)
+        votos_totalizados = self._gerar_votos_totalizados(self._tally)
         totalizacao = self._criar_totalizacao_votos(votos_totalizados)
         self._assinar_totalizacao(totalizacao)
         return totalizacao
 
-    def _contabilizar_votos(self) -> dict:
+    def _marca_valida(self) -> bool:
+        """
+        Verifica se a marca d'água ainda corresponde à cadeia e às chaves em uso.
+
+        :return: True se a apuração acumulada puder ser continuada, False caso contrário.
+        """
+        if self._indice_marca < 0:
+            return True
+        chain = self.voto_service.blockchain.chain
+        return (self._impressao_marca == self.criptografia_service.impressao_chaves
+                and self._indice_marca < len(chain)
+                and chain[self._indice_marca].hash == self._hash_marca)
+
+    def _atualizar_tally(self, workers: Optional[int] = None):
+        """
+        Contabiliza na apuração acumulada os blocos selados depois da marca d'água e avança a marca.
+
+        :param workers: Número de processos para a verificação paralela (padrão: no próprio processo).
+        """
+        if not self._marca_valida():
+            self.audit_logger.log(f"Marca d'água da totalização invalidada no bloco {self._indice_marca}; "
+                                  f"recontagem completa.")
+            self._tally = {}
+            self._indice_marca = -1
+            self._hash_marca = None
+
+        chain = self.voto_service.blockchain.chain
+        fim = len(chain)
+        if fim - 1 > self._indice_marca:
+            self._contabilizar_votos(workers, inicio=self._indice_marca + 1, fim=fim, tally=self._tally)
+            self._indice_marca = fim - 1
+            self._hash_marca = chain[fim - 1].hash
+        self._impressao_marca = self.criptografia_service.impressao_chaves
+
+    def _contabilizar_votos(self, workers: Optional[int] = None, inicio: int = 0, fim: Optional[int] = None,
+                            tally: Optional[dict] = None) -> dict:
         """
         Contabiliza os votos válidos a partir da blockchain.
 
+        :param workers: Número de processos para a verificação paralela (padrão: no próprio processo).
+        :param inicio: Índice do primeiro bloco a contabilizar.
+        :param fim: Índice posterior ao último bloco a contabilizar (padrão: final da cadeia).
+        :param tally: Apuração a atualizar (padrão: uma nova apuração).
         :return: Um dicionário com a contagem de votos por candidato.
         """
-        tally = {}
-        for block in self.voto_service.blockchain.chain:
+        self.cache_votos.validar_chaves(self.criptografia_service.impressao_chaves)
+        tally = {} if tally is None else tally
+        chain = self.voto_service.blockchain.chain
+        fim = len(chain) if fim is None else fim
+        blocos = (chain[indice] for indice in range(inicio, fim))
+        if workers and workers > 1:
+            # Totalização fatiada: os processos devolvem as apurações parciais e os votos verificados, que
+            # alimentam o cache; faixas já verificadas por completo são contabilizadas a partir do cache
+            totalizador = TotalizadorFatiado(self.criptografia_service, workers)
+            parcial, motivos = totalizador.contabilizar(chain, inicio, fim, cache=self.cache_votos)
+            for motivo in motivos:
+                self.audit_logger.log(f"Voto inválido na totalização: {motivo}")
+            mesclar_apuracoes(tally, parcial)
+            return tally
+
+        for block in blocos:
             for transaction in block.transactions:
                 voto = self._obter_voto_valido(transaction)
                 if voto:
                     self._atualizar_contagem_votos(tally, voto)
         return tally
 
-    def _obter_voto_valido(self, transaction: str) -> Voto:
+    def apuracao_parcial(self) -> dict:
         """
-        Obtém um voto válido a partir de uma transação na blockchain.
+        Retorna a apuração corrente mantida pelo serviço de votação, sem percorrer a blockchain.
 
-        :param transaction: A transação contendo o voto criptografado.
-        :return: O voto válido, se a assinatura for válida, ou None caso contrário.
+        :return: Um dicionário com a quantidade de votos por ID de candidato.
+        """
+        return self.voto_service.obter_apuracao()
+
+    def conferir_apuracao(self) -> bool:
+        """
+        Confere a apuração corrente com uma recontagem completa a partir da blockchain.
+
+        :return: True se as contagens coincidirem, False caso contrário.
         """
-        voto_descriptografado = self.criptografia_service.descriptografar_dados(transaction)
-        voto_assinado = json.loads(voto_descriptografado)
-        voto_json = voto_assinado["voto"]
-        assinatura = base64.b64decode(voto_assinado["assinatura"])
+        recontagem = {candidato_id: dados["votos"] for candidato_id, dados in self._contabilizar_votos().items()}
+        confere = recontagem == self.apuracao_parcial()
+        if not confere:
+            self.audit_logger.log(f"Divergência entre apuração corrente e recontagem: {recontagem}")
+        return confere
 
-        if self.criptografia_service.verificar_assinatura(voto_json, assinatura):
-            return Voto.parse_raw(voto_json)
+    def _obter_voto_valido(self, transaction: Union[str, bytes]) -> Union[Voto, VotoVerificado]:
+        """
+        Obtém um voto válido a partir de uma transação na blockchain.
+
+        :param transaction: A transação contendo o voto criptografado.
+        :return: O voto válido (ou os campos de contagem guardados no cache), se a assinatura for válida, ou None
+            caso contrário.
+        """
+        digest = hash_leaf(transaction)
+        voto = self.cache_votos.obter(digest)
+        if voto is not None:
+            return voto
+
+        voto, motivo = self.criptografia_service.verificar_transacao(transaction)
+        if voto is not None:
+            self.cache_votos.adicionar(digest, voto)
+            return voto
         else:
-            print("Voto inválido: assinatura não confere")
+            self.audit_logger.log(f"Voto inválido na totalização: {motivo}")
             return None
 
-    def _atualizar_contagem_votos(self, tally: dict, voto: Voto):
+    def _atualizar_contagem_votos(self, tally: dict, voto: Union[Voto, VotoVerificado]):
         """
         Atualiza a contagem de votos para um candidato específico.
 
         :param tally: O dicionário de contagem de votos.
         :param voto: O voto a ser contabilizado.
         """
-        candidato_id = voto.candidato.id
-        if candidato_id in tally:
-            tally[candidato_id]["votos"] += 1
-        else:
-            tally[candidato_id] = {
-                "candidato": voto.candidato,
-                "votos": 1,
-                "hash_localizacao": voto.hash_localizacao,
-                "hash_blockchain": voto.hash_blockchain,
-                "qr_code": voto.qr_code
-            }
+        contabilizar_voto(tally, voto)
 
     def _gerar_votos_totalizados(self, tally: dict) -> List[Voto]:
         """
@@ -505,11 +1781,14 @@ class TotalizacaoVotosService:
         :param votos_totalizados: A lista de votos totalizados.
         :return: O objeto de totalização de votos.
         """
+        self._totalizacoes += 1
         return TotalizacaoVotos(
-            id=1,
+            id=self._totalizacoes,
             data_hora=datetime.now(),
             votos_totalizados=votos_totalizados,
-            hash_blockchain=self.voto_service.blockchain.chain[-1].hash
+            hash_blockchain=self.voto_service.blockchain.chain[-1].hash,
+            indice_ultimo_bloco=self._indice_marca,
+            hash_ultimo_bloco=self._hash_marca
         )
 
     def _assinar_totalizacao(self, totalizacao: TotalizacaoVotos):
@@ -518,9 +1797,8 @@ class TotalizacaoVotosService:
 
         :param totalizacao: O objeto de totalização de votos a ser assinado.
         """
-        totalizacao_dict = totalizacao.dict(exclude_none=True)
-        assinatura_totalizacao = self.criptografia_service.assinar_dados(
-            json.dumps(totalizacao_dict, default=datetime_to_string, sort_keys=True))
+        assinatura_totalizacao = self.criptografia_service.assinar_fluxo(
+            iterar_json_canonico(totalizacao, exclude={'assinatura'}))
         totalizacao.assinatura = base64.b64encode(assinatura_totalizacao).decode()
         self.audit_logger.log(f"Totalização de votos assinada: {totalizacao}")
 
@@ -531,10 +1809,9 @@ class TotalizacaoVotosService:
         :param totalizacao: O objeto de totalização de votos a ser verificado.
         :return: True se a assinatura for válida, False caso contrário.
         """
-        totalizacao_dict = totalizacao.dict(exclude_none=True, exclude={'assinatura'})
         assinatura_totalizacao = base64.b64decode(totalizacao.assinatura)
-        return self.criptografia_service.verificar_assinatura(
-            json.dumps(totalizacao_dict, default=datetime_to_string, sort_keys=True),
+        return self.criptografia_service.verificar_assinatura_fluxo(
+            iterar_json_canonico(totalizacao, exclude={'assinatura'}),
             assinatura_totalizacao,
         )
 
@@ -610,25 +1887,50 @@ class SistemaVotacao:
     Classe principal do sistema de votação, responsável por coordenar os serviços e funcionalidades.
     """
 
-    def __init__(self, chave_privada_path: str, chave_criptografia_path: str):
+    ARQUIVO_CACHE_VOTOS = "votos_verificados.cache"
+
+    def __init__(self, chave_privada_path: str, chave_criptografia_path: str,
+                 politica_lote: Optional[BatchPolicy] = None, diretorio_blockchain: Optional[str] = None,
+                 assinatura_em_lote: bool = False, formato_envelope: int = ENVELOPE_V2,
+                 capacidade_filtro_nonces: Optional[int] = None, boletim_agregado: bool = False):
         """
         Inicializa o sistema de votação com os serviços necessários.
 
         :param chave_privada_path: Caminho para a chave privada.
         :param chave_criptografia_path: Caminho para a chave de criptografia.
+        :param politica_lote: Política de agrupamento de votos em blocos (padrão: um bloco por voto).
+        :param diretorio_blockchain: Diretório do armazenamento persistente da blockchain (padrão: em memória).
+        :param assinatura_em_lote: Se True, assina cada lote de votos uma única vez (raiz de Merkle do lote).
+        :param formato_envelope: Formato dos votos gravados na blockchain (ENVELOPE_V2 ou ENVELOPE_V1).
+        :param capacidade_filtro_nonces: Quantidade de votos para dimensionar o filtro de Bloom de nonces
+            (padrão: sem filtro, apenas o índice exato).
+        :param boletim_agregado: Se True, os boletins de urna trazem apenas a contagem por candidato, o hash final
+            e a raiz de Merkle dos blocos, em vez da lista de votos.
         """
         self.criptografia_service = CriptografiaService(chave_privada_path, chave_criptografia_path)
-        self.blockchain = Blockchain()
+        armazenamento = SegmentedChainStore(diretorio_blockchain) if diretorio_blockchain else None
+        self.blockchain = Blockchain(batch_policy=politica_lote, store=armazenamento)
         self.integrity_verifier = IntegrityVerifier()
         self.nonce_generator = NonceGenerator()
         self.audit_logger = AuditLogger()
         self.voto_service = VotoService(self.criptografia_service, self.blockchain,
                                         self.integrity_verifier, self.nonce_generator,
-                                        self.audit_logger)
-        self.boletim_urna_service = BoletimUrnaService(self.criptografia_service, self.voto_service)
+                                        self.audit_logger, assinatura_em_lote, formato_envelope,
+                                        capacidade_filtro_nonces)
+        self.boletim_urna_service = BoletimUrnaService(self.criptografia_service, self.voto_service,
+                                                       boletim_agregado)
+        # Com a cadeia em disco, o cache de votos verificados é persistido ao lado dela
+        caminho_cache = None
+        if diretorio_blockchain:
+            caminho_cache = (Path(diretorio_blockchain) / self.ARQUIVO_CACHE_VOTOS).as_posix()
+        cache_votos = CacheVotosVerificados(
+            caminho=caminho_cache,
+            chave_autenticacao=self.criptografia_service.derivar_chave(CacheVotosVerificados.CONTEXTO_CHAVE),
+            audit_logger=self.audit_logger
+        )
         self.totalizacao_votos_service = TotalizacaoVotosService(
             self.criptografia_service, self.voto_service,
-            self.audit_logger
+            self.audit_logger, cache_votos
         )
         self.anomalia_service = AnomaliaService()
 
@@ -641,6 +1943,90 @@ class SistemaVotacao:
         """
         return self.voto_service.votar(candidato)
 
+    def criar_pipeline_assincrono(self, capacidade: int = 1024, workers_assinatura: Optional[int] = None):
+        """
+        Cria a fachada assíncrona de ingestão de votos, para uso a partir de um laço de eventos (ex.: FastAPI).
+
+        :param capacidade: Quantidade máxima de votos em cada fila do pipeline.
+        :param workers_assinatura: Número de threads de assinatura (padrão: número de CPUs).
+        :return: O pipeline, a ser iniciado com `async with` ou `await pipeline.iniciar()`.
+        """
+        from core.processors.pipeline import PipelineVotacaoAssincrona
+        return PipelineVotacaoAssincrona(self.voto_service, capacidade, workers_assinatura)
+
+    def encerrar_votacao(self):
+        """
+        Encerra a votação, forçando a selagem do último bloco.
+        """
+        self.voto_service.encerrar_votacao()
+
+    def salvar_snapshot(self, caminho: str):
+        """
+        Grava um snapshot do sistema de votação: cabeça e índices da blockchain e o estado dos serviços.
+
+        Cadeias persistidas em disco não são copiadas; o snapshot referencia o armazenamento e registra a cabeça.
+
+        :param caminho: O caminho do arquivo de snapshot.
+        """
+        write_snapshot(caminho, {
+            "blockchain": self.blockchain.export_state(),
+            "voto_service": self.voto_service.exportar_estado(),
+            "boletim_urna_service": self.boletim_urna_service.exportar_estado(),
+        })
+        # O cache de votos verificados é independente do snapshot e persistido no próprio arquivo, se configurado
+        if self.totalizacao_votos_service.cache_votos.caminho is not None:
+            self.totalizacao_votos_service.cache_votos.salvar()
+        self.audit_logger.log(f"Snapshot gravado em {caminho}: {len(self.blockchain.chain)} blocos, "
+                              f"hash final {self.blockchain.chain[-1].hash}")
+
+    def restaurar_snapshot(self, caminho: str):
+        """
+        Restaura o sistema de votação a partir de um snapshot, sem reprocessar nem reassinar os votos.
+
+        Apenas o hash do snapshot e a cabeça da blockchain são conferidos. Blocos gravados em disco depois do
+        snapshot são conferidos e os seus votos são incorporados ao estado restaurado.
+
+        :param caminho: O caminho do arquivo de snapshot.
+        """
+        estado = read_snapshot(caminho)
+        blocos_snapshot = self.blockchain.load_state(estado["blockchain"])
+        self.voto_service.carregar_estado(estado["voto_service"])
+        self.boletim_urna_service.carregar_estado(estado["boletim_urna_service"])
+        if blocos_snapshot < len(self.blockchain.chain):
+            # Blocos gravados em disco depois do snapshot: apenas eles são verificados e contabilizados
+            incorporados = self.voto_service.recuperar_blocos(blocos_snapshot)
+            self.audit_logger.log(f"{len(self.blockchain.chain) - blocos_snapshot} blocos posteriores ao snapshot "
+                                  f"recuperados: {incorporados} votos")
+        self.audit_logger.log(f"Snapshot restaurado de {caminho}: {len(self.blockchain.chain)} blocos, "
+                              f"hash final {self.blockchain.chain[-1].hash}")
+
+    def exportar_blockchain_criptografada(self, caminho: str):
+        """
+        Grava uma cópia criptografada da blockchain, um bloco por vez, com memória constante.
+
+        Cada bloco é gravado em seu formato binário, precedido do seu tamanho.
+
+        :param caminho: O caminho do arquivo de destino.
+        """
+        with open(caminho, 'wb') as arquivo, self.criptografia_service.fluxo.escritor(arquivo) as escritor:
+            for block in self.blockchain.chain:
+                dados = block.to_bytes()
+                escritor.write(TAMANHO_BLOCO_EXPORTADO.pack(len(dados)) + dados)
+        self.audit_logger.log(f"Blockchain exportada para {caminho}: {len(self.blockchain.chain)} blocos")
+
+    def ler_blockchain_criptografada(self, caminho: str) -> Iterator[Block]:
+        """
+        Lê, um bloco por vez, uma cópia gravada por `exportar_blockchain_criptografada`.
+
+        :param caminho: O caminho do arquivo criptografado.
+        :return: Um iterador sobre os blocos, na ordem da cadeia.
+        """
+        with open(caminho, 'rb') as arquivo:
+            leitor = io.BufferedReader(self.criptografia_service.fluxo.leitor(arquivo))
+            while cabecalho := leitor.read(TAMANHO_BLOCO_EXPORTADO.size):
+                (tamanho,) = TAMANHO_BLOCO_EXPORTADO.unpack(cabecalho)
+                yield Block.from_bytes(leitor.read(tamanho))
+
     def gerar_registro_impresso(self, voto: Voto) -> RegistroImpresso:
         """
         Gera um registro impresso do voto.
@@ -659,6 +2045,29 @@ class SistemaVotacao:
         """
         return self.voto_service.validar_votos(registros_impressos)
 
+    def conciliar_registros(self, registros_impressos: Iterable[RegistroImpresso],
+                            workers: Optional[int] = None) -> RelatorioConciliacao:
+        """
+        Concilia todos os registros impressos com os votos eletrônicos, em um relatório completo.
+
+        :param registros_impressos: Iterável de registros impressos dos votos.
+        :param workers: Número de processos para conferir os hashes (padrão: no próprio processo).
+        :return: O relatório de conciliação.
+        """
+        return self.voto_service.conciliar_registros(registros_impressos, workers)
+
+    def importar_votos(self, caminho: str, workers: Optional[int] = None,
+                       selar_a_cada: Optional[int] = 1000) -> Iterator[EventoProcessamento]:
+        """
+        Importa as transações de um arquivo NDJSON (uma transação criptografada por linha), sob demanda.
+
+        :param caminho: O caminho do arquivo.
+        :param workers: Número de processos para verificar os votos em paralelo (padrão: no próprio processo).
+        :param selar_a_cada: Quantidade de votos aceitos por bloco selado.
+        :return: Iterador dos eventos de processamento.
+        """
+        return self.voto_service.processar_votos_stream(ler_transacoes_ndjson(caminho), workers, selar_a_cada)
+
     def gerar_boletim_urna(self) -> BoletimUrna:
         """
         Gera o boletim de urna.
@@ -676,6 +2085,17 @@ class SistemaVotacao:
         """
         return self.boletim_urna_service.validar_boletim_urna(boletim_impresso)
 
+    def validar_boletins_urna(self, boletins: Iterable[BoletimUrna],
+                              workers: Optional[int] = None) -> List[ResultadoValidacaoBoletim]:
+        """
+        Valida em lote os boletins de urna recebidos.
+
+        :param boletins: Iterável de boletins de urna.
+        :param workers: Número de processos para verificar as assinaturas (padrão: no próprio processo).
+        :return: Um resultado por boletim, na ordem recebida.
+        """
+        return self.boletim_urna_service.validar_boletins_urna(boletins, workers)
+
     def gerar_registro_urna(self, boletim_urna: BoletimUrna) -> RegistroUrna:
         """
         Gera um registro de urna a partir do boletim de urna.
@@ -690,13 +2110,30 @@ class SistemaVotacao:
             boletim_urna_eletronico=boletim_urna
         )
 
-    def totalizar_votos(self) -> TotalizacaoVotos:
+    def totalizar_votos(self, workers: Optional[int] = None) -> TotalizacaoVotos:
         """
         Realiza a totalização dos votos.
 
+        :param workers: Número de processos para a verificação paralela dos votos (padrão: no próprio processo).
         :return: O resultado da totalização dos votos.
         """
-        return self.totalizacao_votos_service.totalizar_votos()
+        return self.totalizacao_votos_service.totalizar_votos(workers)
+
+    def apuracao_parcial(self) -> dict:
+        """
+        Retorna a apuração parcial dos votos já selados na blockchain.
+
+        :return: Um dicionário com a quantidade de votos por ID de candidato.
+        """
+        return self.totalizacao_votos_service.apuracao_parcial()
+
+    def conferir_apuracao(self) -> bool:
+        """
+        Confere a apuração parcial com uma recontagem completa a partir da blockchain.
+
+        :return: True se as contagens coincidirem, False caso contrário.
+        """
+        return self.totalizacao_votos_service.conferir_apuracao()
 
     def verificar_integridade_totalizacao(self, totalizacao: TotalizacaoVotos) -> bool:
         """
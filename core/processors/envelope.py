@@ -0,0 +1,130 @@
+# processors/envelope.py
+import base64
+import os
+import struct
+from typing import Optional, Union
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+ENVELOPE_MAGICO = b"UV"
+ENVELOPE_V1 = 1
+ENVELOPE_V2 = 2
+CABECALHO_V2 = ENVELOPE_MAGICO + bytes([ENVELOPE_V2])
+# Prefixo em base64 de um envelope v2 ("UV\x02"), usado para reconhecê-lo na borda de transporte
+PREFIXO_TRANSPORTE_V2 = base64.b64encode(CABECALHO_V2).decode()
+TAMANHO_NONCE = 12
+
+TIPO_INDIVIDUAL = 0
+TIPO_LOTE = 1
+TAMANHO_ASSINATURA = struct.Struct(">H")
+LADOS = {"left": 0, "right": 1}
+
+
+class EnvelopeVoto:
+    """
+    Envelope binário versionado (v2) para votos assinados.
+
+    Substitui o formato v1 (JSON com assinatura em base64, criptografado com Fernet e codificado novamente em
+    base64) por um único bloco binário:
+
+        "UV" | versão (1 byte) | nonce (12 bytes) | AES-256-GCM(conteúdo), com o cabeçalho como dado associado
+
+    O conteúdo cifrado é: tipo (1 byte) | tamanho da assinatura (2 bytes) | assinatura crua | [raiz do lote
+    (32 bytes) | quantidade de passos (1 byte) | passos (lado + hash de 32 bytes)] | JSON do voto.
+
+    A codificação em base64 acontece no máximo uma vez, apenas na borda de transporte.
+    """
+
+    def __init__(self, chave_criptografia: bytes):
+        """
+        Deriva a chave AEAD do envelope a partir da chave de criptografia (Fernet) do sistema.
+
+        :param chave_criptografia: O conteúdo do arquivo da chave de criptografia.
+        """
+        hkdf = HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=b"urna-envelope-voto-v2")
+        self.aead = AESGCM(hkdf.derive(base64.urlsafe_b64decode(chave_criptografia)))
+
+    def selar(self, voto_json: str, assinatura: bytes, lote: Optional[tuple[str, list]] = None) -> bytes:
+        """
+        Monta e criptografa o envelope de um voto.
+
+        :param voto_json: O JSON do voto.
+        :param assinatura: A assinatura do voto ou, em lote, a assinatura da raiz do lote.
+        :param lote: A raiz do lote (hexadecimal) e o caminho de inclusão do voto, se assinado em lote.
+        :return: Os bytes do envelope.
+        """
+        partes = [bytes([TIPO_LOTE if lote else TIPO_INDIVIDUAL]), TAMANHO_ASSINATURA.pack(len(assinatura)),
+                  assinatura]
+        if lote:
+            raiz, caminho = lote
+            partes.append(bytes.fromhex(raiz))
+            partes.append(bytes([len(caminho)]))
+            for lado, irmao in caminho:
+                partes.append(bytes([LADOS[lado]]) + bytes.fromhex(irmao))
+        partes.append(voto_json.encode())
+        nonce = os.urandom(TAMANHO_NONCE)
+        return CABECALHO_V2 + nonce + self.aead.encrypt(nonce, b"".join(partes), CABECALHO_V2)
+
+    def abrir(self, envelope: bytes) -> tuple[str, bytes, Optional[tuple[str, list]]]:
+        """
+        Descriptografa e decodifica um envelope v2.
+
+        :param envelope: Os bytes do envelope.
+        :return: O JSON do voto, a assinatura e o lote (raiz e caminho) ou None.
+        :raises cryptography.exceptions.InvalidTag: Se o envelope foi adulterado ou a chave não confere.
+        :raises ValueError: Se o envelope estiver malformado.
+        """
+        if not eh_envelope_v2(envelope):
+            raise ValueError("O envelope não está no formato v2.")
+        nonce = envelope[len(CABECALHO_V2):len(CABECALHO_V2) + TAMANHO_NONCE]
+        conteudo = memoryview(self.aead.decrypt(nonce, envelope[len(CABECALHO_V2) + TAMANHO_NONCE:], CABECALHO_V2))
+
+        tipo = conteudo[0]
+        (tamanho_assinatura,) = TAMANHO_ASSINATURA.unpack_from(conteudo, 1)
+        posicao = 1 + TAMANHO_ASSINATURA.size
+        assinatura = bytes(conteudo[posicao:posicao + tamanho_assinatura])
+        posicao += tamanho_assinatura
+        lote = None
+        if tipo == TIPO_LOTE:
+            raiz = bytes(conteudo[posicao:posicao + 32]).hex()
+            passos = conteudo[posicao + 32]
+            posicao += 33
+            caminho = []
+            for _ in range(passos):
+                lado = "left" if conteudo[posicao] == LADOS["left"] else "right"
+                caminho.append((lado, bytes(conteudo[posicao + 1:posicao + 33]).hex()))
+                posicao += 33
+            lote = (raiz, caminho)
+        elif tipo != TIPO_INDIVIDUAL:
+            raise ValueError(f"Tipo de envelope desconhecido: {tipo}")
+        return bytes(conteudo[posicao:]).decode(), assinatura, lote
+
+
+def eh_envelope_v2(transacao: Union[str, bytes]) -> bool:
+    """
+    Indica se a transação é um envelope v2, em bytes ou na forma de transporte (base64).
+
+    :param transacao: A transação.
+    :return: True para envelopes v2, False para o formato v1.
+    """
+    if isinstance(transacao, (bytes, bytearray, memoryview)):
+        return bytes(transacao[:len(CABECALHO_V2)]) == CABECALHO_V2
+    return transacao.startswith(PREFIXO_TRANSPORTE_V2)
+
+
+def para_transporte(envelope: bytes) -> str:
+    """
+    Codifica um envelope em base64 para transmissão em canais de texto.
+    """
+    return base64.b64encode(envelope).decode()
+
+
+def de_transporte(transacao: Union[str, bytes]) -> Union[str, bytes]:
+    """
+    Converte um envelope v2 recebido em base64 para bytes; transações v1 são devolvidas sem alteração.
+    """
+    if isinstance(transacao, str) and eh_envelope_v2(transacao):
+        return base64.b64decode(transacao)
+    return transacao
@@ -0,0 +1,200 @@
+# processors/fluxo.py
+import base64
+import io
+import os
+import struct
+from typing import BinaryIO, Iterator
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+FLUXO_MAGICO = b"UF"
+FLUXO_VERSAO = 1
+# Cabeçalho: mágico | versão | tamanho dos blocos de texto claro | prefixo do nonce
+CABECALHO_FLUXO = struct.Struct(">2sBI7s")
+# Cada quadro: indicador de último quadro | tamanho do texto cifrado, seguido do texto cifrado
+CABECALHO_QUADRO = struct.Struct(">BI")
+TAMANHO_TAG = 16
+TAMANHO_BLOCO_PADRAO = 64 * 1024
+
+
+class CifraFluxo:
+    """
+    Criptografia autenticada em fluxo, em quadros AES-256-GCM de tamanho fixo, com memória constante.
+
+    O nonce de cada quadro é formado pelo prefixo aleatório do fluxo, pelo contador do quadro e pelo indicador de
+    último quadro, e o cabeçalho do fluxo é o dado associado de todos os quadros. Assim, quadros reordenados,
+    removidos, duplicados ou um fluxo truncado são detectados na descriptografia.
+    """
+
+    def __init__(self, chave_criptografia: bytes):
+        """
+        Deriva a chave AEAD do fluxo a partir da chave de criptografia (Fernet) do sistema.
+
+        :param chave_criptografia: O conteúdo do arquivo da chave de criptografia.
+        """
+        hkdf = HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=b"urna-fluxo-v1")
+        self.aead = AESGCM(hkdf.derive(base64.urlsafe_b64decode(chave_criptografia)))
+
+    def escritor(self, destino: BinaryIO, tamanho_bloco: int = TAMANHO_BLOCO_PADRAO) -> 'EscritorFluxo':
+        """
+        Abre um escritor que criptografa tudo o que for escrito nele, gravando os quadros no destino.
+
+        :param destino: O arquivo (ou objeto semelhante) de destino, aberto em modo binário.
+        :param tamanho_bloco: O tamanho do texto claro de cada quadro.
+        :return: O escritor; o fluxo só é válido depois de fechado.
+        :raises ValueError: Se o tamanho do bloco não for positivo.
+        """
+        return EscritorFluxo(self.aead, destino, tamanho_bloco)
+
+    def leitor(self, origem: BinaryIO) -> 'LeitorFluxo':
+        """
+        Abre um leitor que descriptografa e autentica os quadros lidos da origem.
+
+        :param origem: O arquivo (ou objeto semelhante) criptografado, aberto em modo binário.
+        :return: O leitor.
+        """
+        return LeitorFluxo(self.aead, origem)
+
+    def criptografar(self, origem: BinaryIO, destino: BinaryIO, tamanho_bloco: int = TAMANHO_BLOCO_PADRAO):
+        """
+        Criptografa o conteúdo da origem no destino, um bloco por vez.
+
+        :param origem: O arquivo de origem, aberto em modo binário.
+        :param destino: O arquivo de destino, aberto em modo binário.
+        :param tamanho_bloco: O tamanho do texto claro de cada quadro.
+        :raises ValueError: Se o tamanho do bloco não for positivo.
+        """
+        with self.escritor(destino, tamanho_bloco) as escritor:
+            while bloco := origem.read(tamanho_bloco):
+                escritor.write(bloco)
+
+    def descriptografar(self, origem: BinaryIO, destino: BinaryIO):
+        """
+        Descriptografa o conteúdo da origem no destino, um quadro por vez.
+
+        Os quadros são gravados no destino à medida que são autenticados; se uma exceção for levantada, o
+        conteúdo já gravado deve ser descartado.
+
+        :param origem: O arquivo criptografado, aberto em modo binário.
+        :param destino: O arquivo de destino, aberto em modo binário.
+        :raises cryptography.exceptions.InvalidTag: Se algum quadro foi adulterado ou a chave não confere.
+        :raises ValueError: Se o fluxo estiver malformado ou truncado.
+        """
+        for bloco in self.leitor(origem).blocos():
+            destino.write(bloco)
+
+
+class EscritorFluxo(io.RawIOBase):
+    """
+    Objeto de arquivo somente escrita que criptografa os dados em quadros de tamanho fixo.
+    """
+
+    def __init__(self, aead: AESGCM, destino: BinaryIO, tamanho_bloco: int):
+        super().__init__()
+        if tamanho_bloco <= 0:
+            # Marca o objeto incompleto como fechado, para que `close` não grave um quadro quando for coletado
+            super().close()
+            raise ValueError(f"O tamanho do bloco deve ser positivo: {tamanho_bloco}")
+        self.aead = aead
+        self.destino = destino
+        self.tamanho_bloco = tamanho_bloco
+        self.cabecalho = CABECALHO_FLUXO.pack(FLUXO_MAGICO, FLUXO_VERSAO, tamanho_bloco, os.urandom(7))
+        self.prefixo_nonce = self.cabecalho[-7:]
+        self.contador = 0
+        self.pendente = bytearray()
+        self.destino.write(self.cabecalho)
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, dados) -> int:
+        self.pendente += dados
+        # Mantém ao menos um byte pendente, de forma que o último quadro seja sempre gravado por `close`
+        while len(self.pendente) > self.tamanho_bloco:
+            self._gravar_quadro(bytes(self.pendente[:self.tamanho_bloco]), ultimo=False)
+            del self.pendente[:self.tamanho_bloco]
+        return len(dados)
+
+    def _gravar_quadro(self, bloco: bytes, ultimo: bool):
+        nonce = self.prefixo_nonce + struct.pack(">IB", self.contador, ultimo)
+        cifrado = self.aead.encrypt(nonce, bloco, self.cabecalho)
+        self.destino.write(CABECALHO_QUADRO.pack(ultimo, len(cifrado)))
+        self.destino.write(cifrado)
+        self.contador += 1
+
+    def close(self):
+        if not self.closed:
+            self._gravar_quadro(bytes(self.pendente), ultimo=True)
+            self.pendente.clear()
+        super().close()
+
+    def abortar(self):
+        """
+        Fecha o escritor sem gravar o último quadro, de forma que o fluxo incompleto seja rejeitado na leitura.
+        """
+        self.pendente.clear()
+        super().close()
+
+    def __exit__(self, tipo, valor, traceback):
+        if tipo is not None:
+            self.abortar()
+        return super().__exit__(tipo, valor, traceback)
+
+
+class LeitorFluxo(io.RawIOBase):
+    """
+    Objeto de arquivo somente leitura que descriptografa e autentica um fluxo gravado por EscritorFluxo.
+    """
+
+    def __init__(self, aead: AESGCM, origem: BinaryIO):
+        super().__init__()
+        self.aead = aead
+        self.origem = origem
+        self.cabecalho = self._ler_exato(CABECALHO_FLUXO.size)
+        magico, versao, self.tamanho_bloco, self.prefixo_nonce = CABECALHO_FLUXO.unpack(self.cabecalho)
+        if magico != FLUXO_MAGICO:
+            raise ValueError("O conteúdo não é um fluxo criptografado.")
+        if versao != FLUXO_VERSAO:
+            raise ValueError(f"Versão de fluxo não suportada: {versao}")
+        self.contador = 0
+        self.terminado = False
+        self.atual = memoryview(b"")
+
+    def _ler_exato(self, tamanho: int) -> bytes:
+        dados = self.origem.read(tamanho)
+        if len(dados) != tamanho:
+            raise ValueError("Fluxo criptografado truncado.")
+        return dados
+
+    def _ler_quadro(self) -> bytes:
+        ultimo, tamanho = CABECALHO_QUADRO.unpack(self._ler_exato(CABECALHO_QUADRO.size))
+        if ultimo > 1 or tamanho > self.tamanho_bloco + TAMANHO_TAG:
+            raise ValueError("Quadro de fluxo criptografado malformado.")
+        nonce = self.prefixo_nonce + struct.pack(">IB", self.contador, ultimo)
+        bloco = self.aead.decrypt(nonce, self._ler_exato(tamanho), self.cabecalho)
+        self.contador += 1
+        if ultimo:
+            self.terminado = True
+            if self.origem.read(1):
+                raise ValueError("Dados após o último quadro do fluxo criptografado.")
+        return bloco
+
+    def blocos(self) -> Iterator[bytes]:
+        """
+        Itera sobre os blocos de texto claro, na ordem em que foram gravados.
+        """
+        while not self.terminado:
+            yield self._ler_quadro()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self.atual and not self.terminado:
+            self.atual = memoryview(self._ler_quadro())
+        tamanho = min(len(buffer), len(self.atual))
+        buffer[:tamanho] = self.atual[:tamanho]
+        self.atual = self.atual[tamanho:]
+        return tamanho
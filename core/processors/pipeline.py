@@ -0,0 +1,188 @@
+# processors/pipeline.py
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from core.models.classes import Candidato, Voto
+from core.processors.classes import VotoService
+
+# Marcador de fim das filas, enviado por `encerrar`
+_FIM = object()
+
+
+class PipelineVotacaoAssincrona:
+    """
+    Fachada assíncrona de ingestão de votos, com filas limitadas e contrapressão.
+
+    Os votos passam por três estágios:
+
+    - preparação: criação do voto, na thread de estado;
+    - assinatura: assinatura e criptografia, em um pool de threads (omitido no modo de assinatura em lote);
+    - selagem: registro na blockchain na ordem de chegada, na thread de estado.
+
+    Todo acesso ao estado do VotoService acontece em uma única thread, de forma que o laço de eventos nunca fica
+    bloqueado e o serviço não precisa ser thread-safe. Quando a fila de entrada está cheia, `votar` aguarda até
+    haver espaço.
+
+    Se a política de agrupamento tiver `max_interval_ms`, o estágio de selagem confere o prazo periodicamente
+    enquanto a fila estiver vazia, de forma que os votos pendentes são selados mesmo sem a chegada de novos votos.
+    """
+
+    def __init__(self, voto_service: VotoService, capacidade: int = 1024, workers_assinatura: Optional[int] = None):
+        """
+        Inicializa o pipeline; os estágios são iniciados por `iniciar` ou pelo gerenciador de contexto.
+
+        :param voto_service: Serviço de votação.
+        :param capacidade: Quantidade máxima de votos em cada fila.
+        :param workers_assinatura: Número de threads de assinatura (padrão: número de CPUs).
+        """
+        self.voto_service = voto_service
+        self.capacidade = capacidade
+        self.workers_assinatura = workers_assinatura or os.cpu_count() or 1
+        self._fila_entrada: Optional[asyncio.Queue] = None
+        self._fila_assinatura: Optional[asyncio.Queue] = None
+        self._fila_selagem: Optional[asyncio.Queue] = None
+        self._executor_estado: Optional[ThreadPoolExecutor] = None
+        self._executor_assinatura: Optional[ThreadPoolExecutor] = None
+        self._tarefas: list = []
+        self._votos_registrados = 0
+        self._votos_rejeitados = 0
+
+    async def iniciar(self):
+        """
+        Cria as filas e inicia os estágios do pipeline no laço de eventos corrente.
+        """
+        self._fila_entrada = asyncio.Queue(self.capacidade)
+        self._fila_assinatura = asyncio.Queue(self.capacidade)
+        self._fila_selagem = asyncio.Queue(self.capacidade)
+        self._executor_estado = ThreadPoolExecutor(max_workers=1, thread_name_prefix="votacao-estado")
+        self._executor_assinatura = ThreadPoolExecutor(max_workers=self.workers_assinatura,
+                                                       thread_name_prefix="votacao-assinatura")
+        self._tarefas = [asyncio.create_task(self._preparar())]
+        self._tarefas += [asyncio.create_task(self._assinar()) for _ in range(self.workers_assinatura)]
+        self._tarefas.append(asyncio.create_task(self._selar()))
+
+    async def encerrar(self):
+        """
+        Processa os votos já enfileirados, sela as transações pendentes e libera os recursos do pipeline.
+        """
+        await self._fila_entrada.put(_FIM)
+        await asyncio.gather(*self._tarefas)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor_estado, self.voto_service.selar_pendentes)
+        self._executor_estado.shutdown()
+        self._executor_assinatura.shutdown()
+        self._tarefas = []
+
+    async def __aenter__(self) -> 'PipelineVotacaoAssincrona':
+        await self.iniciar()
+        return self
+
+    async def __aexit__(self, tipo, valor, traceback):
+        await self.encerrar()
+
+    async def enfileirar(self, candidato: Candidato) -> asyncio.Future:
+        """
+        Enfileira um voto, aguardando espaço na fila de entrada se ela estiver cheia.
+
+        :param candidato: O candidato escolhido pelo eleitor.
+        :return: Um futuro resolvido com o voto quando ele for registrado na blockchain.
+        """
+        futuro = asyncio.get_running_loop().create_future()
+        await self._fila_entrada.put((candidato, futuro))
+        return futuro
+
+    async def votar(self, candidato: Candidato) -> Voto:
+        """
+        Realiza um voto para um candidato, sem bloquear o laço de eventos.
+
+        :param candidato: O candidato escolhido pelo eleitor.
+        :return: O voto registrado.
+        """
+        return await (await self.enfileirar(candidato))
+
+    def metricas(self) -> dict:
+        """
+        Retorna a profundidade de cada fila e os contadores do pipeline.
+
+        :return: Um dicionário com as métricas por estágio.
+        """
+        return {
+            "capacidade": self.capacidade,
+            "fila_entrada": self._fila_entrada.qsize() if self._fila_entrada else 0,
+            "fila_assinatura": self._fila_assinatura.qsize() if self._fila_assinatura else 0,
+            "fila_selagem": self._fila_selagem.qsize() if self._fila_selagem else 0,
+            "votos_registrados": self._votos_registrados,
+            "votos_rejeitados": self._votos_rejeitados,
+        }
+
+    async def _preparar(self):
+        loop = asyncio.get_running_loop()
+        while (item := await self._fila_entrada.get()) is not _FIM:
+            candidato, futuro = item
+            try:
+                voto, voto_json = await loop.run_in_executor(self._executor_estado,
+                                                             self.voto_service.preparar_voto, candidato)
+            except Exception as erro:
+                self._rejeitar(futuro, erro)
+                continue
+            # O futuro da assinatura preserva a ordem de chegada no estágio de selagem
+            assinatura = loop.create_future()
+            await self._fila_selagem.put((voto, voto_json, assinatura, futuro))
+            if self.voto_service.assinatura_em_lote:
+                assinatura.set_result(None)
+            else:
+                await self._fila_assinatura.put((voto_json, assinatura))
+        for _ in range(self.workers_assinatura):
+            await self._fila_assinatura.put(_FIM)
+        await self._fila_selagem.put(_FIM)
+
+    async def _assinar(self):
+        loop = asyncio.get_running_loop()
+        while (item := await self._fila_assinatura.get()) is not _FIM:
+            voto_json, assinatura = item
+            try:
+                assinatura.set_result(await loop.run_in_executor(self._executor_assinatura,
+                                                                 self.voto_service.assinar_voto, voto_json))
+            except Exception as erro:
+                assinatura.set_exception(erro)
+
+    def _intervalo_verificacao_prazo(self) -> Optional[float]:
+        # Metade do prazo da política, em segundos: o atraso máximo da selagem fica em 1,5 vez o prazo
+        intervalo_ms = self.voto_service.blockchain.batch_policy.max_interval_ms
+        return max(intervalo_ms / 2000, 0.001) if intervalo_ms is not None else None
+
+    async def _proximo_para_selagem(self):
+        intervalo = self._intervalo_verificacao_prazo()
+        if intervalo is None:
+            return await self._fila_selagem.get()
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                return await asyncio.wait_for(self._fila_selagem.get(), intervalo)
+            except asyncio.TimeoutError:
+                await loop.run_in_executor(self._executor_estado, self.voto_service.selar_se_vencido)
+
+    async def _selar(self):
+        loop = asyncio.get_running_loop()
+        while (item := await self._proximo_para_selagem()) is not _FIM:
+            voto, voto_json, assinatura, futuro = item
+            try:
+                voto_criptografado = await assinatura
+                await loop.run_in_executor(self._executor_estado, self.voto_service.registrar_voto,
+                                           voto, voto_json, voto_criptografado)
+            except Exception as erro:
+                # O voto rejeitado não entra na lista de votos; o ID reservado é liberado quando possível
+                await loop.run_in_executor(self._executor_estado, self.voto_service.descartar_voto, voto)
+                self._rejeitar(futuro, erro)
+                continue
+            self._votos_registrados += 1
+            if not futuro.done():
+                futuro.set_result(voto)
+
+    def _rejeitar(self, futuro: asyncio.Future, erro: Exception):
+        self._votos_rejeitados += 1
+        self.voto_service.audit_logger.log(f"Voto rejeitado pelo pipeline: {type(erro).__name__}: {erro}")
+        if not futuro.done():
+            futuro.set_exception(erro)
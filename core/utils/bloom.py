@@ -0,0 +1,48 @@
+import hashlib
+import math
+
+
+class FiltroBloom:
+    """
+    Filtro de Bloom para testes de pertinência aproximados em memória compacta.
+
+    Não há falsos negativos: se `item in filtro` for False, o item certamente não foi adicionado. Um resultado True
+    pode ser um falso positivo, com a probabilidade configurada, e deve ser confirmado em um índice exato.
+    """
+
+    def __init__(self, capacidade: int, taxa_falsos_positivos: float = 1e-6):
+        """
+        Dimensiona o filtro para a capacidade e a taxa de falsos positivos desejadas.
+
+        :param capacidade: A quantidade de itens esperada.
+        :param taxa_falsos_positivos: A probabilidade de falso positivo com o filtro na capacidade.
+        """
+        capacidade = max(1, capacidade)
+        self.capacidade = capacidade
+        self.tamanho_bits = max(8, math.ceil(-capacidade * math.log(taxa_falsos_positivos) / math.log(2) ** 2))
+        self.funcoes_hash = max(1, round(self.tamanho_bits / capacidade * math.log(2)))
+        self.bits = bytearray((self.tamanho_bits + 7) // 8)
+        self.quantidade = 0
+
+    def _posicoes(self, item: str):
+        # Hashing duplo (Kirsch-Mitzenmacher): k posições a partir de um único digest de 128 bits
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.tamanho_bits for i in range(self.funcoes_hash))
+
+    def adicionar(self, item: str):
+        """
+        Adiciona um item ao filtro.
+
+        :param item: O item.
+        """
+        for posicao in self._posicoes(item):
+            self.bits[posicao >> 3] |= 1 << (posicao & 7)
+        self.quantidade += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[posicao >> 3] & (1 << (posicao & 7)) for posicao in self._posicoes(item))
+
+    def __len__(self) -> int:
+        return self.quantidade
@@ -0,0 +1,50 @@
+import json
+from typing import Iterator, Optional
+
+from pydantic import BaseModel
+
+from core.utils.datetime import datetime_to_string
+
+_encoder = json.JSONEncoder(sort_keys=True, default=datetime_to_string)
+
+
+def _lista_de_modelos(valor) -> bool:
+    return isinstance(valor, list) and bool(valor) and isinstance(valor[0], BaseModel)
+
+
+def iterar_json_canonico(modelo: BaseModel, exclude: Optional[set] = None) -> Iterator[bytes]:
+    """
+    Serializa um modelo em JSON canônico, em partes, sem montar o documento completo em memória.
+
+    O resultado concatenado é idêntico a
+    `json.dumps(modelo.dict(exclude_none=True, exclude=exclude), default=datetime_to_string, sort_keys=True)`,
+    o formato já usado nas assinaturas, mas listas de modelos (como os votos de um boletim) são convertidas e
+    serializadas um item por vez.
+
+    :param modelo: O modelo a serializar.
+    :param exclude: Campos do primeiro nível a excluir.
+    :return: Iterador das partes do JSON, em UTF-8.
+    """
+    exclude = set(exclude or ())
+    listas = {nome for nome in type(modelo).model_fields
+              if nome not in exclude and _lista_de_modelos(getattr(modelo, nome))}
+    campos = modelo.dict(exclude_none=True, exclude=exclude | listas)
+
+    yield b"{"
+    for posicao, nome in enumerate(sorted(set(campos) | listas)):
+        yield ((", " if posicao else "") + _encoder.encode(nome) + ": ").encode()
+        if nome in listas:
+            yield b"["
+            for indice, item in enumerate(getattr(modelo, nome)):
+                yield ((", " if indice else "") + _encoder.encode(item.dict(exclude_none=True))).encode()
+            yield b"]"
+        else:
+            yield _encoder.encode(campos[nome]).encode()
+    yield b"}"
+
+
+def bytes_canonicos(modelo: BaseModel, exclude: Optional[set] = None) -> bytes:
+    """
+    Retorna o JSON canônico completo de um modelo (ver `iterar_json_canonico`).
+    """
+    return b"".join(iterar_json_canonico(modelo, exclude))
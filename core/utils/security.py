@@ -2,20 +2,29 @@ from pathlib import Path
 
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
 
 
 class KeyManager:
+    RSA = "rsa"
+    ED25519 = "ed25519"
+
     def __init__(self, private_key_path: str):
         self.private_key_path = Path(private_key_path)
         self.private_key = None
 
-    def generate_private_key(self):
-        # Gera uma chave privada RSA de 2048 bits
-        self.private_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=2048
-        )
+    def generate_private_key(self, algorithm: str = RSA):
+        if algorithm == self.RSA:
+            # Gera uma chave privada RSA de 2048 bits
+            self.private_key = rsa.generate_private_key(
+                public_exponent=65537,
+                key_size=2048
+            )
+        elif algorithm == self.ED25519:
+            # Gera uma chave privada Ed25519 (assinatura e verificação mais rápidas)
+            self.private_key = ed25519.Ed25519PrivateKey.generate()
+        else:
+            raise ValueError(f"Algoritmo de chave não suportado: {algorithm}")
 
     def save_private_key(self):
         if self.private_key is None:
@@ -0,0 +1,137 @@
+from abc import ABC, abstractmethod
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ed25519, padding, rsa, utils
+
+
+class SignatureScheme(ABC):
+    """
+    Esquema de assinatura digital.
+
+    As assinaturas produzidas pelo sistema são marcadas com um byte identificando o esquema, seguido da assinatura
+    crua, de forma que o verificador sabe qual algoritmo usar sem depender de configuração externa.
+
+    Atributos:
+        name (str): Nome do esquema.
+        tag (int): Byte que identifica o esquema no início da assinatura.
+    """
+
+    name = None
+    tag = None
+
+    @abstractmethod
+    def sign(self, private_key, data: bytes) -> bytes:
+        ...
+
+    @abstractmethod
+    def verify(self, public_key, signature: bytes, data: bytes) -> bool:
+        ...
+
+    def tag_signature(self, signature: bytes) -> bytes:
+        return bytes([self.tag]) + signature
+
+
+class PrehashedSignatureScheme(SignatureScheme):
+    """
+    Esquema que também assina o digest SHA-256 dos dados, com o mesmo resultado da assinatura dos dados originais.
+
+    Permite assinar conteúdos produzidos em fluxo sem mantê-los em memória.
+    """
+
+    @abstractmethod
+    def sign_digest(self, private_key, digest: bytes) -> bytes:
+        ...
+
+    @abstractmethod
+    def verify_digest(self, public_key, signature: bytes, digest: bytes) -> bool:
+        ...
+
+
+class RsaPssScheme(PrehashedSignatureScheme):
+    """
+    RSA-PSS com SHA-256 e salt de tamanho máximo.
+    """
+
+    name = "rsa-pss-sha256"
+    tag = 1
+
+    def _padding(self):
+        return padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH)
+
+    def sign(self, private_key, data: bytes) -> bytes:
+        return private_key.sign(data, self._padding(), hashes.SHA256())
+
+    def verify(self, public_key, signature: bytes, data: bytes) -> bool:
+        try:
+            public_key.verify(signature, data, self._padding(), hashes.SHA256())
+            return True
+        except InvalidSignature:
+            return False
+
+    # A assinatura do digest é idêntica à assinatura dos dados originais
+    def sign_digest(self, private_key, digest: bytes) -> bytes:
+        return private_key.sign(digest, self._padding(), utils.Prehashed(hashes.SHA256()))
+
+    def verify_digest(self, public_key, signature: bytes, digest: bytes) -> bool:
+        try:
+            public_key.verify(signature, digest, self._padding(), utils.Prehashed(hashes.SHA256()))
+            return True
+        except InvalidSignature:
+            return False
+
+
+class Ed25519Scheme(SignatureScheme):
+    """
+    Ed25519: assinaturas de 64 bytes, com assinatura e verificação muito mais rápidas que RSA-2048.
+    """
+
+    name = "ed25519"
+    tag = 2
+
+    def sign(self, private_key, data: bytes) -> bytes:
+        return private_key.sign(data)
+
+    def verify(self, public_key, signature: bytes, data: bytes) -> bool:
+        try:
+            public_key.verify(signature, data)
+            return True
+        except InvalidSignature:
+            return False
+
+
+SCHEMES = {scheme.tag: scheme for scheme in (RsaPssScheme(), Ed25519Scheme())}
+
+
+def scheme_for_key(key) -> SignatureScheme:
+    """
+    Detecta o esquema de assinatura a partir do tipo da chave (privada ou pública) carregada do PEM.
+
+    :param key: A chave privada ou pública.
+    :return: O esquema de assinatura correspondente.
+    :raises ValueError: Se o tipo de chave não for suportado.
+    """
+    if isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+        return SCHEMES[RsaPssScheme.tag]
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return SCHEMES[Ed25519Scheme.tag]
+    raise ValueError(f"Tipo de chave não suportado para assinatura: {type(key).__name__}")
+
+
+def split_signature(signature: bytes, public_key) -> tuple[SignatureScheme, bytes]:
+    """
+    Separa o esquema e a assinatura crua de uma assinatura marcada.
+
+    Assinaturas RSA anteriores à marcação (sem o byte de esquema) são reconhecidas pelo tamanho, que é igual ao
+    tamanho da chave.
+
+    :param signature: A assinatura marcada (ou RSA sem marcação).
+    :param public_key: A chave pública usada na verificação.
+    :return: O esquema e a assinatura crua.
+    :raises ValueError: Se o esquema for desconhecido.
+    """
+    if isinstance(public_key, rsa.RSAPublicKey) and len(signature) == public_key.key_size // 8:
+        return SCHEMES[RsaPssScheme.tag], signature
+    if not signature or signature[0] not in SCHEMES:
+        raise ValueError("Assinatura com esquema desconhecido.")
+    return SCHEMES[signature[0]], signature[1:]
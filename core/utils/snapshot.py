@@ -0,0 +1,83 @@
+import hashlib
+import hmac
+import io
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Optional
+
+SNAPSHOT_MAGIC = b"URNASNAP"
+SNAPSHOT_VERSION = 1
+DIGEST_SIZE = hashlib.sha256().digest_size
+
+
+class SnapshotError(ValueError):
+    """
+    Erro levantado quando um snapshot está corrompido, adulterado ou em formato desconhecido.
+    """
+
+
+class _PrimitiveUnpickler(pickle.Unpickler):
+    """
+    Unpickler restrito a tipos primitivos (dict, list, tuple, str, bytes, int, float, bool e None).
+
+    O snapshot nunca contém objetos arbitrários, então qualquer referência a classes ou funções é recusada.
+    """
+
+    def find_class(self, module, name):
+        raise SnapshotError(f"Referência não permitida no snapshot: {module}.{name}")
+
+
+def _digest(payload, key: Optional[bytes]) -> bytes:
+    if key is None:
+        return hashlib.sha256(payload).digest()
+    return hmac.new(key, payload, hashlib.sha256).digest()
+
+
+def write_snapshot(path: str, state: dict[str, Any], key: Optional[bytes] = None):
+    """
+    Grava o estado em um arquivo de snapshot de forma atômica.
+
+    O arquivo contém um cabeçalho fixo, o SHA-256 do conteúdo e o conteúdo serializado, de forma que a
+    restauração exige apenas a conferência desse hash. Com uma chave, o SHA-256 é substituído por um HMAC-SHA256,
+    e o arquivo não pode ser alterado por quem não possui a chave.
+
+    :param path: O caminho do arquivo de snapshot.
+    :param state: O estado a ser gravado, composto apenas por tipos primitivos.
+    :param key: Chave de autenticação do conteúdo (opcional).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+    temporary_path = path.with_suffix(path.suffix + ".tmp")
+    with open(temporary_path, 'wb') as file:
+        file.write(SNAPSHOT_MAGIC)
+        file.write(bytes([SNAPSHOT_VERSION]))
+        file.write(_digest(payload, key))
+        file.write(payload)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, path)
+
+
+def read_snapshot(path: str, key: Optional[bytes] = None) -> dict[str, Any]:
+    """
+    Lê um arquivo de snapshot, conferindo o cabeçalho e o hash do conteúdo.
+
+    :param path: O caminho do arquivo de snapshot.
+    :param key: Chave de autenticação usada na gravação, se houver.
+    :return: O estado gravado.
+    :raises SnapshotError: Se o arquivo estiver corrompido ou em formato desconhecido.
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+    header_size = len(SNAPSHOT_MAGIC) + 1
+    if data[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+        raise SnapshotError(f"O arquivo não é um snapshot: {path}")
+    if data[len(SNAPSHOT_MAGIC)] != SNAPSHOT_VERSION:
+        raise SnapshotError(f"Versão de snapshot não suportada: {data[len(SNAPSHOT_MAGIC)]}")
+    digest = data[header_size:header_size + DIGEST_SIZE]
+    payload = memoryview(data)[header_size + DIGEST_SIZE:]
+    if not hmac.compare_digest(_digest(payload, key), digest):
+        raise SnapshotError(f"O hash do snapshot não confere: {path}")
+    return _PrimitiveUnpickler(io.BytesIO(payload)).load()
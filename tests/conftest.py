@@ -0,0 +1,28 @@
+import pytest
+
+from core.models.classes import Candidato, Cargo, Eleicao, Partido
+from core.processors.classes import SistemaVotacao
+from core.settings import ROOT_DIR
+
+
+@pytest.fixture
+def candidatos():
+    eleicao = Eleicao(id=1, nome="Eleição Municipal 2024", data="2024-10-06", turnos=1)
+    partido = Partido(numero=45, sigla="PA", nome="Partido A")
+    cargo = Cargo(id=1, nome="Prefeito", eleicao=eleicao.id)
+    return [
+        Candidato(id=numero, nome=f"Candidato {numero}", partido=partido, codigo=f"45{numero}", foto="foto",
+                  cargo=cargo, eleicao=eleicao)
+        for numero in (1, 2, 3)
+    ]
+
+
+@pytest.fixture
+def criar_sistema():
+    def criar(**kwargs):
+        return SistemaVotacao(
+            chave_privada_path=(ROOT_DIR / 'resources/private_key.pem').as_posix(),
+            chave_criptografia_path=(ROOT_DIR / 'resources/cryptography_key.pem').as_posix(),
+            **kwargs
+        )
+    return criar
@@ -0,0 +1,27 @@
+import pickle
+import uuid
+
+from core.models.classes import Voto
+from core.processors.armazem import ArmazemVotos
+
+
+def test_restored_store_keeps_compact_votes_and_exceptions(candidatos):
+    votos = [
+        Voto(id=indice, candidato=candidatos[indice % len(candidatos)], hash_localizacao=f"{indice:064x}",
+             hash_blockchain=f"{indice + 1:064x}", qr_code=f"qrcode_{indice}", nonce=str(uuid.uuid4()))
+        for indice in range(5)
+    ]
+    # Voto sem nonce (como os votos totalizados), guardado como exceção às colunas compactas
+    votos.append(Voto(id=5, candidato=candidatos[0], hash_localizacao="fora-do-formato",
+                      hash_blockchain="00" * 32, qr_code="qr personalizado"))
+    armazem = ArmazemVotos()
+    for voto in votos:
+        armazem.append(voto)
+
+    restaurado = ArmazemVotos.carregar_estado(pickle.loads(pickle.dumps(armazem.exportar_estado())))
+
+    assert list(restaurado) == votos
+    assert restaurado.nonce(5) is None
+    assert restaurado.posicao_por_nonce(votos[3].nonce) == 3
+    assert restaurado.posicao_por_nonce(None) == 5
+    assert restaurado.posicao_por_id(5) == 5
@@ -0,0 +1,18 @@
+import pytest
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_batch_validation_reports_one_result_per_boletim(criar_sistema, candidatos, workers):
+    sistema = criar_sistema()
+    for candidato in candidatos:
+        sistema.votar(candidato)
+    boletim = sistema.gerar_boletim_urna()
+    adulterado = boletim.copy(update={"municipio": "Outro"})
+    sem_assinatura = boletim.copy(update={"assinatura": None})
+
+    resultados = sistema.boletim_urna_service.validar_boletins_urna(
+        [boletim, adulterado, sem_assinatura, boletim], workers=workers, tamanho_lote=1)
+
+    assert [resultado.valido for resultado in resultados] == [True, False, False, True]
+    assert [resultado.motivo for resultado in resultados] == [
+        None, "assinatura inválida", "assinatura ausente", None]
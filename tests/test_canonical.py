@@ -0,0 +1,19 @@
+import json
+
+from core.utils.canonical import bytes_canonicos
+from core.utils.datetime import datetime_to_string
+
+
+def test_canonical_bytes_reflect_in_place_changes(criar_sistema, candidatos):
+    sistema = criar_sistema()
+    for candidato in candidatos:
+        sistema.votar(candidato)
+    totalizacao = sistema.totalizar_votos()
+    assert sistema.verificar_integridade_totalizacao(totalizacao)
+
+    totalizacao.votos_totalizados[0].candidato = candidatos[1]
+
+    esperado = json.dumps(totalizacao.dict(exclude_none=True, exclude={'assinatura'}),
+                          default=datetime_to_string, sort_keys=True).encode()
+    assert bytes_canonicos(totalizacao, exclude={'assinatura'}) == esperado
+    assert not sistema.verificar_integridade_totalizacao(totalizacao)
@@ -0,0 +1,22 @@
+import pytest
+
+from core.models.classes import RegistroImpresso
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_reconciliation_reports_every_discrepancy(criar_sistema, candidatos, workers):
+    sistema = criar_sistema()
+    votos = [sistema.votar(candidato) for candidato in candidatos * 2]
+    registros = [sistema.gerar_registro_impresso(voto) for voto in votos[:4]]
+    registros[1] = RegistroImpresso(voto=votos[1].copy(update={"candidato": candidatos[0]}),
+                                    data_hora=registros[1].data_hora)
+    registros.append(registros[0])
+
+    relatorio = sistema.voto_service.conciliar_registros(registros, workers=workers, tamanho_lote=1)
+
+    assert relatorio.total_registros == 5
+    assert relatorio.conferidos == [votos[0].id, votos[2].id, votos[3].id]
+    assert relatorio.divergentes == [votos[1].id]
+    assert relatorio.duplicados == [votos[0].id]
+    assert relatorio.ausentes == [votos[4].id, votos[5].id]
+    assert relatorio.extras == []
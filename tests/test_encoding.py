@@ -0,0 +1,40 @@
+import os
+import time
+from datetime import timedelta, timezone
+
+import pytest
+
+from core.blockchain.encoding import timestamp_from_legacy
+
+
+@pytest.fixture
+def set_local_timezone():
+    original = os.environ.get("TZ")
+
+    def set_timezone(name):
+        os.environ["TZ"] = name
+        time.tzset()
+
+    yield set_timezone
+    if original is None:
+        os.environ.pop("TZ", None)
+    else:
+        os.environ["TZ"] = original
+    time.tzset()
+
+
+@pytest.mark.skipif(not hasattr(time, "tzset"), reason="time.tzset is not available on this platform")
+def test_legacy_timestamp_does_not_depend_on_local_timezone(set_local_timezone):
+    conversions = set()
+    for name in ("UTC", "America/Sao_Paulo", "Asia/Tokyo"):
+        set_local_timezone(name)
+        conversions.add(timestamp_from_legacy("2024-10-06 08:00:00"))
+
+    assert conversions == {1728201600 * 1_000_000}
+
+
+def test_legacy_timestamp_uses_given_timezone():
+    brasilia = timezone(timedelta(hours=-3))
+
+    assert timestamp_from_legacy("2024-10-06 08:00:00", brasilia) == (1728201600 + 3 * 3600) * 1_000_000
+    assert timestamp_from_legacy(1728201600 * 1_000_000, brasilia) == 1728201600 * 1_000_000
@@ -0,0 +1,35 @@
+import io
+
+import pytest
+
+from core.processors.fluxo import CifraFluxo
+from core.settings import ROOT_DIR
+
+
+@pytest.fixture
+def cifra():
+    with open(ROOT_DIR / 'resources/cryptography_key.pem', 'rb') as arquivo:
+        return CifraFluxo(arquivo.read())
+
+
+@pytest.mark.parametrize("tamanho_bloco", [0, -1])
+def test_non_positive_block_size_is_rejected(cifra, tamanho_bloco):
+    destino = io.BytesIO()
+
+    with pytest.raises(ValueError):
+        cifra.escritor(destino, tamanho_bloco)
+    with pytest.raises(ValueError):
+        cifra.criptografar(io.BytesIO(b"dados"), destino, tamanho_bloco)
+    assert destino.getvalue() == b""
+
+
+@pytest.mark.parametrize("tamanho_bloco", [1, 3, 1024])
+def test_stream_round_trip(cifra, tamanho_bloco):
+    dados = bytes(range(256)) * 10
+    cifrado = io.BytesIO()
+    cifra.criptografar(io.BytesIO(dados), cifrado, tamanho_bloco)
+
+    claro = io.BytesIO()
+    cifra.descriptografar(io.BytesIO(cifrado.getvalue()), claro)
+
+    assert claro.getvalue() == dados
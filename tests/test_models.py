@@ -0,0 +1,24 @@
+from core.models.classes import TotalizacaoVotos, Voto
+
+
+def test_vote_without_nonce_survives_json_round_trip(candidatos):
+    voto = Voto(id=1, candidato=candidatos[0], hash_localizacao="00" * 32, hash_blockchain="00" * 32,
+                qr_code="qrcode_1")
+
+    restaurado = Voto.parse_raw(voto.json())
+
+    assert restaurado.nonce is None
+    assert restaurado == voto
+
+
+def test_totalization_survives_json_round_trip(criar_sistema, candidatos):
+    sistema = criar_sistema()
+    for candidato in candidatos:
+        sistema.votar(candidato)
+    totalizacao = sistema.totalizar_votos()
+
+    restaurada = TotalizacaoVotos.parse_raw(totalizacao.json())
+
+    assert restaurada.votos_totalizados == totalizacao.votos_totalizados
+    assert restaurada.assinatura == totalizacao.assinatura
+    assert sistema.verificar_integridade_totalizacao(restaurada)
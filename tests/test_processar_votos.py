@@ -0,0 +1,23 @@
+import pytest
+
+from core.processors.envelope import para_transporte
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_undecodable_v2_transaction_is_reported_as_invalid(criar_sistema, candidatos, workers):
+    origem = criar_sistema()
+    transacoes = []
+    for candidato in candidatos:
+        voto, voto_json = origem.voto_service.preparar_voto(candidato)
+        transacoes.append(para_transporte(origem.voto_service.assinar_voto(voto_json)))
+    # Prefixo de envelope v2 seguido de base64 com comprimento inválido
+    transacoes.insert(1, "VVYCa")
+
+    destino = criar_sistema()
+    eventos = list(destino.voto_service.processar_votos_stream(iter(transacoes), workers=workers))
+
+    invalidos = [evento for evento in eventos if evento.tipo == "invalido"]
+    assert [evento.indice for evento in invalidos] == [1]
+    assert eventos[-1].processados == 4
+    assert eventos[-1].aceitos == 3
+    assert eventos[-1].rejeitados == 1
@@ -0,0 +1,61 @@
+import pytest
+
+from core.blockchain.merkle import hash_leaf
+from core.processors.classes import TotalizadorFatiado
+
+
+@pytest.fixture
+def sistema(criar_sistema, candidatos):
+    sistema = criar_sistema()
+    for candidato in candidatos * 3:
+        sistema.votar(candidato)
+    sistema.blockchain.add_block(["transacao-invalida"])
+    sistema.votar(candidatos[0])
+    return sistema
+
+
+@pytest.fixture
+def auditoria(sistema, monkeypatch):
+    mensagens = []
+    monkeypatch.setattr(sistema.audit_logger, "log", mensagens.append)
+    return mensagens
+
+
+def _votos_invalidos(mensagens):
+    return [mensagem for mensagem in mensagens if mensagem.startswith("Voto inválido na totalização")]
+
+
+def test_sharded_totalization_feeds_verified_vote_cache(sistema, auditoria):
+    servico = sistema.totalizacao_votos_service
+
+    sistema.totalizar_votos(workers=2)
+
+    assert len(servico.cache_votos) == 10
+    assert len(_votos_invalidos(auditoria)) == 1
+    recontagem = servico._contabilizar_votos()
+    assert recontagem == servico._tally
+    assert {candidato_id: dados["votos"] for candidato_id, dados in recontagem.items()} == {1: 4, 2: 3, 3: 3}
+
+
+def test_sequential_totalization_logs_invalid_votes(sistema, auditoria, capsys):
+    sistema.totalizar_votos()
+
+    assert len(_votos_invalidos(auditoria)) == 1
+    assert "Voto inválido" not in capsys.readouterr().out
+
+
+def test_fully_cached_ranges_are_counted_from_cache(sistema, candidatos):
+    cache = sistema.totalizacao_votos_service.cache_votos
+    chain = sistema.blockchain.chain
+    sistema.totalizar_votos(workers=2)
+    # Entradas apontando para outro candidato mostram que as faixas foram contabilizadas a partir do cache
+    for indice in range(1, 4):
+        for transacao in chain[indice].transactions:
+            voto = cache.obter(hash_leaf(transacao))
+            cache.adicionar(hash_leaf(transacao), voto._replace(candidato=candidatos[2]))
+
+    totalizador = TotalizadorFatiado(sistema.criptografia_service, workers=2, faixas_por_processo=1)
+    apuracao, motivos = totalizador.contabilizar(chain, 1, 4, cache=cache)
+
+    assert motivos == []
+    assert {candidato_id: dados["votos"] for candidato_id, dados in apuracao.items()} == {3: 3}
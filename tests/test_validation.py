@@ -0,0 +1,42 @@
+import pytest
+
+from core.blockchain.classes import Blockchain
+from core.blockchain.validation import ParallelChainValidator
+
+
+def _tamper_hash(block):
+    block.hash = "00" * 32
+
+
+def _tamper_timestamp(block):
+    block.timestamp += 1
+
+
+def _tamper_previous_hash(block):
+    block.previous_hash = "ab" * 32
+
+
+@pytest.fixture
+def blockchain():
+    blockchain = Blockchain()
+    for index in range(20):
+        blockchain.add_block([f"transacao-{index}-a", f"transacao-{index}-b"])
+    return blockchain
+
+
+def test_valid_chain_has_no_invalid_block(blockchain):
+    assert blockchain.find_first_invalid_block() is None
+    assert ParallelChainValidator(workers=2).find_first_invalid_block(blockchain.chain) is None
+
+
+@pytest.mark.parametrize("tamper", [_tamper_hash, _tamper_timestamp, _tamper_previous_hash])
+@pytest.mark.parametrize("index", [10, 11])
+def test_parallel_and_sequential_report_same_first_invalid_block(blockchain, tamper, index):
+    tamper(blockchain.chain[index])
+
+    sequential = blockchain.find_first_invalid_block()
+    parallel = ParallelChainValidator(workers=2).find_first_invalid_block(blockchain.chain)
+
+    assert sequential == index
+    assert parallel == sequential
+    assert not blockchain.is_chain_valid(full=True, workers=2)